@@ -1,8 +1,15 @@
 # core/admin.py
 from django.contrib import admin
-from .models import Race
+from .models import Race, RaceJob
 
 @admin.register(Race)
 class RaceAdmin(admin.ModelAdmin):
-    list_display = ('name','category','start_time','is_active')
-    list_filter = ('is_active','category')
+    list_display = ('name','category','start_time','state')
+    list_filter = ('state','category')
+
+@admin.register(RaceJob)
+class RaceJobAdmin(admin.ModelAdmin):
+    list_display = ('race','kind','status','attempts','updated_at','finished_at')
+    list_filter = ('kind','status')
+    list_select_related = ('race__category',)
+    readonly_fields = ('race','kind','attempts','claimed_by','created_at','updated_at','finished_at','error')
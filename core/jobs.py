@@ -0,0 +1,152 @@
+# core/jobs.py
+"""
+Race lifecycle jobs.
+
+``enqueue(race, kind)`` records a RaceJob at most once per (race, kind),
+serialised by a PostgreSQL advisory lock, and hands it to a worker after
+commit: an in-process thread pool by default, or Celery when
+RACE_JOBS_USE_CELERY is set. Handlers are registered by the apps that own
+the work (see tracking.lifecycle).
+
+A failed job is re-queued by the next ``enqueue`` of the same kind. A
+running job holds a lease: the claim stores a token in ``claimed_by`` and a
+heartbeat thread refreshes ``updated_at`` every third of RACE_JOB_LEASE
+seconds. ``sweep`` (``manage.py sweep_race_jobs``, run by start.sh)
+re-submits running jobs whose lease expired, i.e. lost with their process,
+and queued jobs older than RACE_JOB_STALE_AFTER. A superseded run cannot
+record its result over the newer one. Handlers must still tolerate being
+re-run after a lost worker.
+"""
+import logging
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, connection, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import RaceJob
+
+logger = logging.getLogger(__name__)
+
+_handlers = {}
+_executor = None
+
+
+def register(kind):
+    """Decorator: ``@register("archive")`` on a ``handler(race)`` function."""
+    def decorator(func):
+        _handlers[kind] = func
+        return func
+    return decorator
+
+
+def enqueue(race, kind):
+    """
+    Create and submit the job unless it already exists, or re-queue it if it
+    failed; returns the submitted job or None.
+    """
+    with transaction.atomic():
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT pg_advisory_xact_lock(hashtext(%s))", [f"race_job:{race.pk}:{kind}"])
+        job, created = RaceJob.objects.get_or_create(race=race, kind=kind)
+        if not created:
+            if job.status != RaceJob.FAILED:
+                return None
+            job.status, job.error, job.finished_at = RaceJob.QUEUED, "", None
+            job.save(update_fields=["status", "error", "finished_at", "updated_at"])
+        transaction.on_commit(lambda: submit(job.pk))
+    return job
+
+
+def _lease():
+    return getattr(settings, "RACE_JOB_LEASE", 300)
+
+
+def sweep(stale_after=None):
+    """
+    Re-submit running jobs whose lease expired and jobs left queued longer
+    than ``stale_after`` seconds (default RACE_JOB_STALE_AFTER); returns
+    their ids. Lost jobs already claimed RACE_JOB_MAX_ATTEMPTS times are
+    marked failed instead.
+    """
+    if stale_after is None:
+        stale_after = getattr(settings, "RACE_JOB_STALE_AFTER", 1800)
+    now = timezone.now()
+    stale = RaceJob.objects.filter(
+        Q(status=RaceJob.RUNNING, updated_at__lt=now - timedelta(seconds=_lease()))
+        | Q(status=RaceJob.QUEUED, updated_at__lt=now - timedelta(seconds=stale_after))
+    )
+    stale.filter(attempts__gte=getattr(settings, "RACE_JOB_MAX_ATTEMPTS", 3)).update(
+        status=RaceJob.FAILED, error="gave up: worker lost too many times", claimed_by="",
+        finished_at=now, updated_at=now,
+    )
+    job_ids = []
+    for job_id in stale.values_list("pk", flat=True):
+        # guarded by status and age so two concurrent sweeps re-submit a job once
+        if stale.filter(pk=job_id).update(status=RaceJob.QUEUED, claimed_by="", updated_at=now):
+            job_ids.append(job_id)
+            transaction.on_commit(lambda job_id=job_id: submit(job_id))
+    return job_ids
+
+
+def submit(job_id):
+    if getattr(settings, "RACE_JOBS_USE_CELERY", False):
+        from .tasks import run_race_job
+        run_race_job.delay(job_id)
+    else:
+        _get_executor().submit(run_job, job_id)
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=getattr(settings, "RACE_JOB_WORKERS", 2),
+            thread_name_prefix="race-jobs",
+        )
+    return _executor
+
+
+def _heartbeat(job_id, token, stop):
+    """Keep the lease of a running job alive until ``stop`` is set."""
+    try:
+        while not stop.wait(_lease() / 3):
+            RaceJob.objects.filter(pk=job_id, claimed_by=token).update(updated_at=timezone.now())
+    finally:
+        connection.close()
+
+
+def run_job(job_id):
+    close_old_connections()
+    try:
+        # claim: only one worker moves a queued job to running
+        token = uuid.uuid4().hex
+        claimed = RaceJob.objects.filter(pk=job_id, status=RaceJob.QUEUED).update(
+            status=RaceJob.RUNNING, claimed_by=token, attempts=F("attempts") + 1, updated_at=timezone.now(),
+        )
+        if not claimed:
+            return
+        job = RaceJob.objects.select_related("race__category").get(pk=job_id)
+        stop = threading.Event()
+        threading.Thread(target=_heartbeat, args=(job_id, token, stop), daemon=True).start()
+        status, error = RaceJob.DONE, ""
+        try:
+            _handlers[job.kind](job.race)
+        except Exception as e:
+            logger.exception("race job %s failed", job)
+            status, error = RaceJob.FAILED, str(e)
+        finally:
+            stop.set()
+        # only the holder of the lease records the outcome
+        recorded = RaceJob.objects.filter(pk=job_id, claimed_by=token).update(
+            status=status, error=error, claimed_by="", finished_at=timezone.now(), updated_at=timezone.now(),
+        )
+        if not recorded:
+            logger.warning("race job %s lost its lease; result %s discarded", job, status)
+    finally:
+        close_old_connections()
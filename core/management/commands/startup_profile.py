@@ -0,0 +1,108 @@
+# core/management/commands/startup_profile.py
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# profile name -> ASGI module; each entry point selects its own settings
+PROFILES = {
+    "full": "race_management.asgi",
+    "ingest": "race_management.asgi_ingest",
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Report import-time cost per package and measure readiness time of the ASGI "
+        "entry points, each in a fresh interpreter. --serve boots daphne and polls "
+        "/tracking/healthz/ instead of timing the import alone."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--profile", choices=[*PROFILES, "all"], default="all")
+        parser.add_argument("--top", type=int, default=15, help="Packages to list in the import report")
+        parser.add_argument("--repeat", type=int, default=5, help="Readiness measurements per profile")
+        parser.add_argument("--serve", action="store_true", help="Measure until daphne answers /tracking/healthz/")
+        parser.add_argument("--timeout", type=float, default=60.0)
+
+    def handle(self, *args, **options):
+        names = list(PROFILES) if options["profile"] == "all" else [options["profile"]]
+        for name in names:
+            asgi_module = PROFILES[name]
+            self.stdout.write(self.style.MIGRATE_HEADING(f"{name}: {asgi_module}"))
+            self.import_report(asgi_module, options["top"])
+
+            runs = [
+                self.readiness(asgi_module, options["serve"], options["timeout"])
+                for _ in range(max(options["repeat"], 1))
+            ]
+            mode = "daphne /tracking/healthz/" if options["serve"] else "interpreter start + import"
+            self.stdout.write(
+                f"  ready: min {min(runs):.3f}s  median {statistics.median(runs):.3f}s  "
+                f"max {max(runs):.3f}s  ({len(runs)} runs, {mode})"
+            )
+
+    def _run_kwargs(self):
+        # Unset, as under a bare `daphne <module>:application`, so the report
+        # shows what the entry point itself selects and imports.
+        env = os.environ.copy()
+        env.pop("DJANGO_SETTINGS_MODULE", None)
+        return {"env": env, "cwd": settings.BASE_DIR}
+
+    def import_report(self, asgi_module, top):
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {asgi_module}"],
+            capture_output=True, text=True, **self._run_kwargs(),
+        )
+        if proc.returncode:
+            raise CommandError(f"importing {asgi_module} failed:\n{proc.stderr[-2000:]}")
+
+        # "import time: <self us> | <cumulative us> | <indented module name>"
+        per_package = defaultdict(int)
+        for line in proc.stderr.splitlines():
+            if not line.startswith("import time:") or "self [us]" in line:
+                continue
+            self_us, _, name = line[len("import time:"):].split("|")
+            per_package[name.strip().split(".")[0]] += int(self_us)
+
+        total = sum(per_package.values())
+        self.stdout.write(f"  imports: {total / 1e6:.3f}s self time over {len(per_package)} top-level packages")
+        for package, us in sorted(per_package.items(), key=lambda kv: kv[1], reverse=True)[:top]:
+            self.stdout.write(f"    {us / 1e3:9.1f} ms  {100 * us / total:5.1f}%  {package}")
+
+    def readiness(self, asgi_module, serve, timeout):
+        kwargs = self._run_kwargs()
+        started = time.perf_counter()
+        if not serve:
+            subprocess.run([sys.executable, "-c", f"import {asgi_module}"], check=True, **kwargs)
+            return time.perf_counter() - started
+
+        with socket.socket() as s:
+            s.bind(("127.0.0.1", 0))
+            port = s.getsockname()[1]
+        proc = subprocess.Popen(
+            [sys.executable, "-m", "daphne", "-b", "127.0.0.1", "-p", str(port), f"{asgi_module}:application"],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, **kwargs,
+        )
+        url = f"http://127.0.0.1:{port}/tracking/healthz/"
+        try:
+            while time.perf_counter() - started < timeout:
+                if proc.poll() is not None:
+                    raise CommandError(f"daphne exited with {proc.returncode} before becoming ready")
+                try:
+                    with urllib.request.urlopen(url, timeout=1) as response:
+                        if response.status == 200:
+                            return time.perf_counter() - started
+                except OSError:
+                    time.sleep(0.02)
+            raise CommandError(f"{asgi_module} not ready after {timeout}s")
+        finally:
+            proc.terminate()
+            proc.wait()
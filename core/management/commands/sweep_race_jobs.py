@@ -0,0 +1,24 @@
+# core/management/commands/sweep_race_jobs.py
+from django.core.management.base import BaseCommand
+
+from core import jobs
+
+
+class Command(BaseCommand):
+    help = (
+        "Re-submit race lifecycle jobs stuck in queued/running, e.g. after the pod "
+        "that held them was killed. Run at startup and periodically (cron)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--stale-after", type=int,
+            help="Seconds since the last status change (default: RACE_JOB_STALE_AFTER)",
+        )
+
+    def handle(self, *args, **options):
+        job_ids = jobs.sweep(options["stale_after"])
+        self.stdout.write(f"Re-submitted {len(job_ids)} stale race jobs" + (f": {job_ids}" if job_ids else ""))
+        # without Celery the jobs run in this process: wait for them
+        if job_ids and jobs._executor is not None:
+            jobs._executor.shutdown(wait=True)
@@ -0,0 +1,50 @@
+# Generated by Django 4.2 on 2026-10-19 17:04
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def active_to_running(apps, schema_editor):
+    Race = apps.get_model('core', 'Race')
+    Race.objects.filter(is_active=True).update(state='running')
+
+
+def running_to_active(apps, schema_editor):
+    Race = apps.get_model('core', 'Race')
+    Race.objects.filter(state='running').update(is_active=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='race',
+            name='state',
+            field=models.CharField(choices=[('scheduled', 'Scheduled'), ('running', 'Running'), ('finished', 'Finished'), ('archived', 'Archived')], db_index=True, default='scheduled', max_length=20),
+        ),
+        migrations.RunPython(active_to_running, running_to_active),
+        migrations.RemoveField(
+            model_name='race',
+            name='is_active',
+        ),
+        migrations.CreateModel(
+            name='RaceJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(max_length=30)),
+                ('status', models.CharField(choices=[('queued', 'Queued'), ('running', 'Running'), ('done', 'Done'), ('failed', 'Failed')], default='queued', max_length=10)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('error', models.TextField(blank=True)),
+                ('race', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='jobs', to='core.race')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='racejob',
+            constraint=models.UniqueConstraint(fields=('race', 'kind'), name='racejob_race_kind_uniq'),
+        ),
+    ]
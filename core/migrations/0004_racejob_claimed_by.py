@@ -0,0 +1,18 @@
+# Generated by Django 4.2 on 2026-10-19 20:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_racejob_retry'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='racejob',
+            name='claimed_by',
+            field=models.CharField(blank=True, max_length=32),
+        ),
+    ]
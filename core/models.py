@@ -1,12 +1,108 @@
-from django.db import models
+from django.core.exceptions import ValidationError
+from django.db import models, transaction
 from registration.models import RaceCategory
+from .signals import race_state_changed
+
+
+class InvalidTransition(ValueError):
+    pass
+
 
 class Race(models.Model):
+    SCHEDULED = "scheduled"
+    RUNNING = "running"
+    FINISHED = "finished"
+    ARCHIVED = "archived"
+    STATE_CHOICES = [
+        (SCHEDULED, "Scheduled"),
+        (RUNNING, "Running"),
+        (FINISHED, "Finished"),
+        (ARCHIVED, "Archived"),
+    ]
+    # Allowed lifecycle moves: scheduled -> running -> finished -> archived
+    TRANSITIONS = {
+        SCHEDULED: {RUNNING},
+        RUNNING: {FINISHED},
+        FINISHED: {ARCHIVED},
+        ARCHIVED: set(),
+    }
+
     name = models.CharField(max_length=200)
     category = models.ForeignKey(RaceCategory, on_delete=models.CASCADE)
     start_time = models.DateTimeField()
     location = models.CharField(max_length=200)
-    is_active = models.BooleanField(default=False)
+    state = models.CharField(max_length=20, choices=STATE_CHOICES, default=SCHEDULED, db_index=True)
 
     def __str__(self):
         return f"{self.name} ({self.category.name})"
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_state = instance.__dict__.get("state")
+        return instance
+
+    @property
+    def is_active(self):
+        return self.state == self.RUNNING
+
+    def clean(self):
+        old = getattr(self, "_loaded_state", None)
+        if old and old != self.state and self.state not in self.TRANSITIONS[old]:
+            raise ValidationError({"state": f"Cannot move a race from {old} to {self.state}."})
+
+    def save(self, *args, **kwargs):
+        old = getattr(self, "_loaded_state", None)
+        if old and old != self.state and self.state not in self.TRANSITIONS[old]:
+            raise InvalidTransition(f"{old} -> {self.state}")
+        super().save(*args, **kwargs)
+        self._loaded_state = self.state
+        if old != self.state and (old or self.state != self.SCHEDULED):
+            new = self.state
+            transaction.on_commit(
+                lambda: race_state_changed.send(sender=Race, race=self, old_state=old, new_state=new)
+            )
+
+    def transition_to(self, new_state):
+        """Move to ``new_state``, serialising concurrent transitions on a row lock."""
+        with transaction.atomic():
+            locked = Race.objects.select_for_update().get(pk=self.pk)
+            if new_state not in self.TRANSITIONS[locked.state]:
+                raise InvalidTransition(f"{locked.state} -> {new_state}")
+            locked.state = new_state
+            locked.save(update_fields=["state"])
+        self.state = self._loaded_state = new_state
+
+
+class RaceJob(models.Model):
+    """
+    One lifecycle job (archive, warm-up, teardown) per race and kind; the
+    unique constraint plus an advisory lock in core.jobs make enqueueing
+    idempotent across concurrent saves. Failed jobs are re-queued by the
+    next enqueue of the same kind.
+    """
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    STATUS_CHOICES = [(QUEUED, "Queued"), (RUNNING, "Running"), (DONE, "Done"), (FAILED, "Failed")]
+
+    race = models.ForeignKey(Race, on_delete=models.CASCADE, related_name="jobs")
+    kind = models.CharField(max_length=30)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=QUEUED)
+    created_at = models.DateTimeField(auto_now_add=True)
+    # last status change; core.jobs.sweep re-submits jobs stuck in queued/running
+    updated_at = models.DateTimeField(auto_now=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    # lease token of the worker running the job (core.jobs.run_job)
+    claimed_by = models.CharField(max_length=32, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    error = models.TextField(blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["race", "kind"], name="racejob_race_kind_uniq"),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} for race {self.race_id} ({self.status})"
@@ -0,0 +1,47 @@
+# core/paginators.py
+import json
+
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator for admin changelists over very large tables.
+
+    On PostgreSQL the row count comes from table statistics (``pg_class``)
+    for unfiltered querysets and from the planner's row estimate otherwise,
+    so opening a page never runs ``COUNT(*)`` over millions of rows. Results
+    estimated below ``exact_threshold`` are still counted exactly.
+    """
+
+    exact_threshold = 10000
+
+    @cached_property
+    def count(self):
+        estimate = self.estimated_count()
+        if estimate is None or estimate < self.exact_threshold:
+            return super().count
+        return estimate
+
+    def estimated_count(self):
+        qs = self.object_list
+        connection = connections[qs.db]
+        if connection.vendor != "postgresql":
+            return None
+        with connection.cursor() as cursor:
+            if not qs.query.where:
+                cursor.execute(
+                    "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+                    [qs.model._meta.db_table],
+                )
+                row = cursor.fetchone()
+                # reltuples is -1 until the table has been analyzed
+                return row[0] if row and row[0] >= 0 else None
+            sql, params = qs.query.sql_with_params()
+            cursor.execute("EXPLAIN (FORMAT JSON) " + sql, params)
+            plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
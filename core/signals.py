@@ -0,0 +1,6 @@
+# core/signals.py
+from django.dispatch import Signal
+
+# Sent after commit whenever a Race changes lifecycle state.
+# kwargs: race, old_state, new_state
+race_state_changed = Signal()
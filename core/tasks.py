@@ -0,0 +1,9 @@
+# Importing the project app also configures the broker for .delay() from
+# processes that did not start through asgi.py/wsgi.py (management commands).
+from race_management.celery import app
+from .jobs import run_job
+
+
+@app.task
+def run_race_job(job_id):
+    run_job(job_id)
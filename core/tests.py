@@ -1,3 +1,121 @@
-from django.test import TestCase
+from datetime import datetime, timedelta, timezone
+from unittest import mock
 
-# Create your tests here.
+from django.test import TestCase, override_settings
+from django.utils import timezone as dj_timezone
+
+from registration.models import RaceCategory
+from . import jobs
+from .models import InvalidTransition, Race, RaceJob
+from .signals import race_state_changed
+
+
+class RaceTestCase(TestCase):
+    def setUp(self):
+        category = RaceCategory.objects.create(name="10K", distance_km=10)
+        self.race = Race.objects.create(
+            name="City 10K", category=category, location="Peshawar",
+            start_time=datetime(2026, 10, 1, 7, tzinfo=timezone.utc),
+        )
+
+
+class RaceLifecycleTests(RaceTestCase):
+    def test_transitions_follow_the_lifecycle(self):
+        events = []
+        handler = lambda sender, race, old_state, new_state, **kw: events.append((old_state, new_state))
+        race_state_changed.connect(handler)
+        self.addCleanup(race_state_changed.disconnect, handler)
+
+        with mock.patch.object(jobs, "submit"), self.captureOnCommitCallbacks(execute=True):
+            self.race.transition_to(Race.RUNNING)
+            self.race.transition_to(Race.FINISHED)
+
+        self.assertEqual(Race.objects.get(pk=self.race.pk).state, Race.FINISHED)
+        self.assertEqual(events, [(Race.SCHEDULED, Race.RUNNING), (Race.RUNNING, Race.FINISHED)])
+
+    def test_invalid_transition_is_rejected(self):
+        with self.assertRaises(InvalidTransition):
+            self.race.transition_to(Race.ARCHIVED)
+        race = Race.objects.get(pk=self.race.pk)
+        race.state = Race.FINISHED
+        with self.assertRaises(InvalidTransition):
+            race.save()
+
+
+class RaceJobTests(RaceTestCase):
+    def test_enqueue_is_idempotent_per_race_and_kind(self):
+        with mock.patch.object(jobs, "submit") as submit, self.captureOnCommitCallbacks(execute=True):
+            first = jobs.enqueue(self.race, "archive")
+            second = jobs.enqueue(self.race, "archive")
+
+        self.assertIsNotNone(first)
+        self.assertIsNone(second)
+        self.assertEqual(RaceJob.objects.filter(race=self.race, kind="archive").count(), 1)
+        submit.assert_called_once_with(first.pk)
+
+    def test_run_job_calls_handler_once(self):
+        job = RaceJob.objects.create(race=self.race, kind="test")
+        handler = mock.Mock()
+        with mock.patch.dict(jobs._handlers, {"test": handler}):
+            jobs.run_job(job.pk)
+            jobs.run_job(job.pk)
+
+        handler.assert_called_once()
+        job.refresh_from_db()
+        self.assertEqual(job.status, RaceJob.DONE)
+
+    def test_failed_handler_is_recorded(self):
+        job = RaceJob.objects.create(race=self.race, kind="test")
+        with mock.patch.dict(jobs._handlers, {"test": mock.Mock(side_effect=RuntimeError("boom"))}), \
+                self.assertLogs("core.jobs", "ERROR"):
+            jobs.run_job(job.pk)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.error), (RaceJob.FAILED, "boom"))
+
+    def test_enqueue_requeues_a_failed_job(self):
+        job = RaceJob.objects.create(race=self.race, kind="archive", status=RaceJob.FAILED, error="boom")
+        with mock.patch.object(jobs, "submit") as submit, self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(jobs.enqueue(self.race, "archive"), job)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.error), (RaceJob.QUEUED, ""))
+        submit.assert_called_once_with(job.pk)
+
+    def test_sweep_resubmits_stale_jobs(self):
+        stale = RaceJob.objects.create(race=self.race, kind="archive", status=RaceJob.RUNNING, attempts=1)
+        lost = RaceJob.objects.create(race=self.race, kind="teardown", status=RaceJob.RUNNING, attempts=3)
+        fresh = RaceJob.objects.create(race=self.race, kind="warmup")
+        RaceJob.objects.filter(pk__in=[stale.pk, lost.pk]).update(
+            updated_at=datetime(2026, 10, 1, tzinfo=timezone.utc)
+        )
+        with mock.patch.object(jobs, "submit") as submit, self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(jobs.sweep(stale_after=60), [stale.pk])
+
+        submit.assert_called_once_with(stale.pk)
+        statuses = dict(RaceJob.objects.values_list("pk", "status"))
+        self.assertEqual(
+            [statuses[j.pk] for j in (stale, lost, fresh)], [RaceJob.QUEUED, RaceJob.FAILED, RaceJob.QUEUED]
+        )
+
+    @override_settings(RACE_JOB_LEASE=300)
+    def test_sweep_leaves_running_job_with_valid_lease(self):
+        # older than stale_after, but its heartbeat is within the lease
+        job = RaceJob.objects.create(race=self.race, kind="archive", status=RaceJob.RUNNING, claimed_by="abc")
+        RaceJob.objects.filter(pk=job.pk).update(updated_at=dj_timezone.now() - timedelta(seconds=120))
+        with mock.patch.object(jobs, "submit") as submit, self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(jobs.sweep(stale_after=60), [])
+
+        submit.assert_not_called()
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.claimed_by), (RaceJob.RUNNING, "abc"))
+
+    def test_superseded_run_does_not_record_its_result(self):
+        job = RaceJob.objects.create(race=self.race, kind="test")
+
+        def reclaimed(race):
+            # a sweep re-queued the job and another worker claimed it meanwhile
+            RaceJob.objects.filter(pk=job.pk).update(claimed_by="other")
+
+        with mock.patch.dict(jobs._handlers, {"test": reclaimed}), self.assertLogs("core.jobs", "WARNING"):
+            jobs.run_job(job.pk)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.claimed_by), (RaceJob.RUNNING, "other"))
@@ -1,2 +1,4 @@
-from .celery import app as celery_app
-__all__ = ('celery_app',)
+# The Celery app (race_management.celery) is loaded by the full-profile
+# entry points (asgi.py, wsgi.py), not here, so the ingest profile
+# (asgi_ingest.py) boots without Celery. Workers find it with
+# `celery -A race_management`.
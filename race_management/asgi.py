@@ -12,6 +12,9 @@ django_asgi_app = get_asgi_application()
 # Now safe to import anything using models
 import tracking.routing
 
+# Configure the project's Celery app as current: beat admin and .delay()
+from race_management.celery import app as celery_app  # noqa: F401
+
 application = ProtocolTypeRouter({
     "http": django_asgi_app,
     "websocket": AuthMiddlewareStack(
@@ -0,0 +1,18 @@
+# race_management/asgi_ingest.py
+import os
+from django.core.asgi import get_asgi_application
+from channels.routing import ProtocolTypeRouter, URLRouter
+
+# Forced rather than defaulted: this entry point only makes sense with the
+# ingest settings, whatever the environment says.
+os.environ["DJANGO_SETTINGS_MODULE"] = "race_management.settings_ingest"
+
+django_asgi_app = get_asgi_application()
+
+from race_management.routing import websocket_urlpatterns
+
+# Spectator sockets are anonymous, so no session/auth middleware stack here.
+application = ProtocolTypeRouter({
+    "http": django_asgi_app,
+    "websocket": URLRouter(websocket_urlpatterns),
+})
@@ -1,6 +1,3 @@
-from django.urls import re_path
-from tracking.consumers import RaceConsumer
-
-websocket_urlpatterns = [
-    re_path(r'ws/race/(?P<race_id>\d+)/$', RaceConsumer.as_asgi()),
-]
+# race_management/routing.py
+# WebSocket routes live with the tracking app; re-exported for ASGI entry points.
+from tracking.routing import websocket_urlpatterns  # noqa: F401
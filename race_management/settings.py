@@ -51,6 +51,28 @@ CHANNEL_LAYERS = {
         },
     },
 }
+# Spectator WebSocket backpressure (see tracking.consumers.RaceOutbox)
+TRACKING_WS_OUTBOX_SIZE = int(os.environ.get("TRACKING_WS_OUTBOX_SIZE", 1000))
+TRACKING_WS_SEND_TIMEOUT = float(os.environ.get("TRACKING_WS_SEND_TIMEOUT", 5))
+TRACKING_WS_STALL_TIMEOUT = float(os.environ.get("TRACKING_WS_STALL_TIMEOUT", 15))
+TRACKING_WS_PING_INTERVAL = float(os.environ.get("TRACKING_WS_PING_INTERVAL", 5))  # 0 disables
+
+# Shared cache; holds the per-runner ETA state (tracking.eta)
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": REDIS_URL,
+    },
+}
+TRACKING_ETA_ALPHA = 0.3  # weight of the newest segment in the smoothed pace
+TRACKING_ETA_PUSH_INTERVAL = 5  # seconds between ETA broadcasts per race
+
+# Race lifecycle jobs (core.jobs): in-process thread pool unless Celery is enabled
+RACE_JOB_WORKERS = int(os.environ.get("RACE_JOB_WORKERS", 2))
+RACE_JOBS_USE_CELERY = os.environ.get("RACE_JOBS_USE_CELERY") == "1"
+RACE_JOB_STALE_AFTER = int(os.environ.get("RACE_JOB_STALE_AFTER", 1800))  # seconds a job may wait queued
+RACE_JOB_LEASE = int(os.environ.get("RACE_JOB_LEASE", 300))  # running jobs without a heartbeat this long are lost
+RACE_JOB_MAX_ATTEMPTS = 3
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
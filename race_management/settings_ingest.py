@@ -0,0 +1,27 @@
+# race_management/settings_ingest.py
+"""
+Slim "ingest-only" profile: GPS ingest, spectator WebSocket and ETA APIs.
+
+No admin, DRF, celery beat, sessions, messages or staticfiles, so
+autoscaled pods boot faster during the start-gun spike. Served by the
+race_management.asgi_ingest entry point, which always selects this module;
+see start.sh (APP_PROFILE=ingest).
+"""
+from .settings import *  # noqa: F401,F403
+
+INSTALLED_APPS = [
+    'corsheaders',
+
+    'core',
+    'registration',
+    'tracking',
+]
+
+MIDDLEWARE = [
+    'django.middleware.security.SecurityMiddleware',
+    'corsheaders.middleware.CorsMiddleware',
+    'django.middleware.common.CommonMiddleware',
+]
+
+ROOT_URLCONF = 'race_management.urls_ingest'
+ASGI_APPLICATION = 'race_management.asgi_ingest.application'
@@ -10,6 +10,7 @@ urlpatterns = [
 
     # ✅ include tracking with namespace
     path('tracking/', include(('tracking.urls', 'tracking'), namespace='tracking')),
+    path('registration/', include(('registration.urls', 'registration'), namespace='registration')),
 
     # ✅ redirect root URL to race dashboard 1
     path('', RedirectView.as_view(
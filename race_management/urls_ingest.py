@@ -0,0 +1,10 @@
+# race_management/urls_ingest.py
+from django.urls import path, include
+
+from tracking.urls import api_urlpatterns
+
+# No dashboard page here: it needs staticfiles, which this profile leaves out.
+# Spectators load it from the full profile and open their socket to either.
+urlpatterns = [
+    path('tracking/', include((api_urlpatterns, 'tracking'), namespace='tracking')),
+]
@@ -14,3 +14,6 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'race_management.settings')
 
 application = get_wsgi_application()
+
+# Configure the project's Celery app as current: beat admin and .delay()
+from race_management.celery import app as celery_app  # noqa: E402,F401
@@ -1,12 +1,23 @@
 # registration/admin.py
 from django.contrib import admin
+from core.paginators import EstimatedCountPaginator
 from .models import Runner, RaceCategory
 
 @admin.register(Runner)
 class RunnerAdmin(admin.ModelAdmin):
     list_display = ('bib_number','first_name','last_name','email')
-    search_fields = ('bib_number','first_name','last_name')
+    # icontains on these is served by the trigram indexes on Runner.Meta
+    search_fields = ('first_name','last_name','email')
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def get_search_results(self, request, queryset, search_term):
+        # A bib is an exact lookup on the unique index, not a text scan.
+        term = search_term.strip()
+        if term.isdigit():
+            return queryset.filter(bib_number=int(term)), False
+        return super().get_search_results(request, queryset, search_term)
 
 @admin.register(RaceCategory)
 class RaceCategoryAdmin(admin.ModelAdmin):
-    list_display = ('name','distance_km')
+    list_display = ('name','distance_km','bib_start','bib_end')
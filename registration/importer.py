@@ -0,0 +1,222 @@
+# registration/importer.py
+"""
+Bulk roster import.
+
+The whole batch is validated in memory against the bibs and emails that are
+already registered (plain set lookups, no per-row queries), bibs are allocated
+from each category's ``bib_start``..``bib_end`` range, and the accepted rows
+are inserted in chunks with ``bulk_create`` or PostgreSQL ``COPY``.
+"""
+import csv
+import io
+import time
+
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import connection, transaction
+
+from .models import RaceCategory, Runner
+
+REQUIRED_COLUMNS = ("first_name", "last_name", "email", "category")
+CHUNK_SIZE = 2000
+
+
+class ImportReport:
+    def __init__(self):
+        self.total = 0
+        self.created = 0
+        self.errors = []  # (line number, raw row, message)
+        self.elapsed = 0.0
+
+    @property
+    def rows_per_second(self):
+        return self.total / self.elapsed if self.elapsed else 0.0
+
+    def as_dict(self, max_errors=100):
+        return {
+            "total": self.total,
+            "created": self.created,
+            "failed": len(self.errors),
+            "elapsed_s": round(self.elapsed, 3),
+            "rows_per_second": round(self.rows_per_second, 1),
+            "errors": [
+                {"line": line, "error": message} for line, _, message in self.errors[:max_errors]
+            ],
+        }
+
+    def write_errors(self, fileobj):
+        """Write rejected rows as CSV: the original columns plus line and error."""
+        writer = csv.writer(fileobj)
+        writer.writerow(["line", "error", *REQUIRED_COLUMNS, "bib_number"])
+        for line, row, message in self.errors:
+            writer.writerow(
+                [line, message, *(row.get(c, "") for c in REQUIRED_COLUMNS), row.get("bib_number", "")]
+            )
+
+
+def read_rows(fileobj, filename):
+    """Yield one dict per roster row from a CSV or XLSX upload."""
+    if filename.lower().endswith(".xlsx"):
+        try:
+            from openpyxl import load_workbook
+        except ImportError:
+            raise ValueError("XLSX import requires openpyxl (pip install openpyxl)")
+        sheet = load_workbook(fileobj, read_only=True, data_only=True).active
+        rows = sheet.iter_rows(values_only=True)
+        header = [str(h or "").strip().lower() for h in next(rows, ())]
+        for values in rows:
+            yield {k: "" if v is None else str(v).strip() for k, v in zip(header, values)}
+        return
+
+    text = io.TextIOWrapper(fileobj, encoding="utf-8-sig", newline="")
+    reader = csv.DictReader(text)
+    reader.fieldnames = [(f or "").strip().lower() for f in reader.fieldnames or []]
+    for row in reader:
+        yield {k: (v or "").strip() for k, v in row.items() if k}
+
+
+class BibAllocator:
+    """Hands out free bibs from per-category ranges, skipping every taken bib."""
+
+    def __init__(self, taken_bibs):
+        self.taken = set(taken_bibs)
+        self._cursor = {}
+
+    def claim(self, category, bib):
+        if bib in self.taken:
+            return f"bib {bib} is already taken"
+        if category.bib_start is not None and not (category.bib_start <= bib <= (category.bib_end or bib)):
+            return f"bib {bib} is outside {category.name} range {category.bib_start}-{category.bib_end}"
+        self.taken.add(bib)
+        return None
+
+    def allocate(self, category):
+        if category.bib_start is None or category.bib_end is None:
+            return None
+        bib = self._cursor.get(category.pk, category.bib_start)
+        while bib <= category.bib_end and bib in self.taken:
+            bib += 1
+        if bib > category.bib_end:
+            return None
+        self.taken.add(bib)
+        self._cursor[category.pk] = bib + 1
+        return bib
+
+
+def validate_rows(rows, categories, existing_emails, existing_bibs, report):
+    """
+    Turn raw rows into unsaved ``Runner`` objects, recording rejects on ``report``.
+
+    Explicit bibs are claimed in a first pass so that automatic allocation in
+    the second pass never hands out a bib a later row asked for.
+    """
+    by_key = {}
+    for category in categories:
+        by_key[str(category.pk)] = category
+        by_key[category.name.strip().lower()] = category
+
+    emails = {e.lower() for e in existing_emails}
+    allocator = BibAllocator(existing_bibs)
+    accepted = []  # (line, row, runner)
+
+    for line, row in enumerate(rows, start=2):  # line 1 is the header
+        report.total += 1
+        missing = [c for c in REQUIRED_COLUMNS if not row.get(c)]
+        if missing:
+            report.errors.append((line, row, f"missing {', '.join(missing)}"))
+            continue
+        email = row["email"]
+        try:
+            validate_email(email)
+        except ValidationError:
+            report.errors.append((line, row, f"invalid email {email!r}"))
+            continue
+        if email.lower() in emails:
+            report.errors.append((line, row, f"email {email} is already registered"))
+            continue
+        category = by_key.get(row["category"].strip().lower())
+        if category is None:
+            report.errors.append((line, row, f"unknown category {row['category']!r}"))
+            continue
+
+        runner = Runner(
+            first_name=row["first_name"], last_name=row["last_name"], email=email, category=category
+        )
+        if row.get("bib_number"):
+            try:
+                runner.bib_number = int(row["bib_number"])
+                if runner.bib_number < 0:
+                    raise ValueError
+            except ValueError:
+                report.errors.append((line, row, f"invalid bib {row['bib_number']!r}"))
+                continue
+        # Field limits the database enforces (name/email lengths, integer
+        # range), so one bad row cannot abort the whole insert transaction.
+        try:
+            runner.clean_fields(exclude=["category"] if runner.bib_number is not None else ["category", "bib_number"])
+        except ValidationError as e:
+            report.errors.append((line, row, "; ".join(
+                f"{field}: {' '.join(messages)}" for field, messages in e.message_dict.items()
+            )))
+            continue
+        if runner.bib_number is not None:
+            error = allocator.claim(category, runner.bib_number)
+            if error:
+                report.errors.append((line, row, error))
+                continue
+        emails.add(email.lower())
+        accepted.append((line, row, runner))
+
+    runners = []
+    for line, row, runner in accepted:
+        if runner.bib_number is None:
+            runner.bib_number = allocator.allocate(runner.category)
+            if runner.bib_number is None:
+                report.errors.append((line, row, f"no free bib left in {runner.category.name} range"))
+                continue
+        runners.append(runner)
+    report.errors.sort(key=lambda e: e[0])
+    return runners
+
+
+def _copy_runners(runners):
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    for r in runners:
+        writer.writerow([r.first_name, r.last_name, r.email, r.bib_number, r.category_id])
+    buf.seek(0)
+    with connection.cursor() as cursor:
+        cursor.cursor.copy_expert(
+            f"COPY {Runner._meta.db_table} (first_name, last_name, email, bib_number, category_id) "
+            "FROM STDIN WITH (FORMAT csv)",
+            buf,
+        )
+
+
+def insert_runners(runners, chunk_size=CHUNK_SIZE, use_copy=False):
+    use_copy = use_copy and connection.vendor == "postgresql"
+    with transaction.atomic():
+        for i in range(0, len(runners), chunk_size):
+            chunk = runners[i:i + chunk_size]
+            if use_copy:
+                _copy_runners(chunk)
+            else:
+                Runner.objects.bulk_create(chunk, batch_size=chunk_size)
+    return len(runners)
+
+
+def import_roster(fileobj, filename, chunk_size=CHUNK_SIZE, use_copy=False, dry_run=False):
+    """Validate and insert a roster file; returns an ``ImportReport``."""
+    report = ImportReport()
+    started = time.perf_counter()
+    runners = validate_rows(
+        read_rows(fileobj, filename),
+        RaceCategory.objects.all(),
+        Runner.objects.values_list("email", flat=True).iterator(),
+        Runner.objects.values_list("bib_number", flat=True).iterator(),
+        report,
+    )
+    if not dry_run:
+        report.created = insert_runners(runners, chunk_size=chunk_size, use_copy=use_copy)
+    report.elapsed = time.perf_counter() - started
+    return report
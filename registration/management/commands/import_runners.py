@@ -0,0 +1,41 @@
+# registration/management/commands/import_runners.py
+from django.core.management.base import BaseCommand, CommandError
+from django.db import IntegrityError
+from registration.importer import CHUNK_SIZE, import_roster
+
+
+class Command(BaseCommand):
+    help = "Bulk import runners from a CSV/XLSX roster (first_name, last_name, email, category[, bib_number])"
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+        parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+        parser.add_argument("--copy", action="store_true", help="Load with PostgreSQL COPY instead of bulk_create")
+        parser.add_argument("--errors", help="Where to write rejected rows (default: <path>.errors.csv)")
+        parser.add_argument("--dry-run", action="store_true", help="Validate only, insert nothing")
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        try:
+            with open(path, "rb") as f:
+                report = import_roster(
+                    f, path,
+                    chunk_size=options["chunk_size"],
+                    use_copy=options["copy"],
+                    dry_run=options["dry_run"],
+                )
+        except (OSError, ValueError) as e:
+            raise CommandError(str(e))
+        except IntegrityError as e:
+            raise CommandError(f"Nothing imported, a runner registered meanwhile conflicts: {e}")
+
+        if report.errors:
+            errors_path = options["errors"] or f"{path}.errors.csv"
+            with open(errors_path, "w", newline="") as f:
+                report.write_errors(f)
+            self.stdout.write(self.style.WARNING(f"{len(report.errors)} rows rejected, see {errors_path}"))
+
+        self.stdout.write(
+            f"Imported {report.created}/{report.total} runners in {report.elapsed:.2f}s "
+            f"({report.rows_per_second:.0f} rows/s)"
+        )
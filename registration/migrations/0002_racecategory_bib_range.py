@@ -0,0 +1,23 @@
+# Generated by Django 4.2 on 2026-10-19 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('registration', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='racecategory',
+            name='bib_start',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='racecategory',
+            name='bib_end',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+    ]
@@ -1,8 +1,13 @@
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.db import models
+from django.db.models.functions import Upper
 
 class RaceCategory(models.Model):
     name = models.CharField(max_length=100)  # 5K, 10K, Half Marathon, etc.
     distance_km = models.FloatField()
+    # Inclusive bib range handed out by the bulk importer for this category.
+    bib_start = models.PositiveIntegerField(null=True, blank=True)
+    bib_end = models.PositiveIntegerField(null=True, blank=True)
 
     def __str__(self):
         return f"{self.name} ({self.distance_km} km)"
@@ -15,5 +20,14 @@ class Runner(models.Model):
     bib_number = models.PositiveIntegerField(unique=True)
     category = models.ForeignKey(RaceCategory, on_delete=models.CASCADE)
 
+    class Meta:
+        # Trigram indexes on UPPER(col) back the admin's icontains search
+        # (Django emits UPPER(col::text) LIKE UPPER(%s) on PostgreSQL).
+        indexes = [
+            GinIndex(OpClass(Upper('first_name'), name='gin_trgm_ops'), name='runner_first_name_trgm'),
+            GinIndex(OpClass(Upper('last_name'), name='gin_trgm_ops'), name='runner_last_name_trgm'),
+            GinIndex(OpClass(Upper('email'), name='gin_trgm_ops'), name='runner_email_trgm'),
+        ]
+
     def __str__(self):
         return f"{self.bib_number} - {self.first_name} {self.last_name}"
@@ -1,3 +1,65 @@
-from django.test import TestCase
+import io
 
-# Create your tests here.
+from django.test import SimpleTestCase
+
+from .importer import ImportReport, read_rows, validate_rows
+from .models import RaceCategory
+
+
+class RosterValidationTests(SimpleTestCase):
+    def setUp(self):
+        self.category = RaceCategory(id=1, name="10K", distance_km=10, bib_start=100, bib_end=102)
+
+    def validate(self, rows, emails=(), bibs=()):
+        report = ImportReport()
+        runners = validate_rows(rows, [self.category], emails, bibs, report)
+        return runners, report
+
+    def row(self, email, **extra):
+        return {"first_name": "A", "last_name": "B", "email": email, "category": "10k", **extra}
+
+    def test_allocates_free_bibs_from_category_range(self):
+        runners, report = self.validate(
+            [self.row("a@x.com"), self.row("b@x.com", bib_number="101")], bibs=[100]
+        )
+        self.assertEqual(report.errors, [])
+        self.assertEqual(sorted(r.bib_number for r in runners), [101, 102])
+
+    def test_rejects_duplicate_and_existing_emails(self):
+        runners, report = self.validate(
+            [self.row("a@x.com"), self.row("A@x.com"), self.row("old@x.com")], emails=["old@x.com"]
+        )
+        self.assertEqual(len(runners), 1)
+        self.assertEqual([line for line, _, _ in report.errors], [3, 4])
+
+    def test_rejects_taken_out_of_range_and_exhausted_bibs(self):
+        runners, report = self.validate(
+            [
+                self.row("a@x.com", bib_number="100"),
+                self.row("b@x.com", bib_number="500"),
+                self.row("c@x.com"),
+                self.row("d@x.com"),
+                self.row("e@x.com"),
+            ],
+            bibs=[100],
+        )
+        self.assertEqual(len(runners), 2)
+        self.assertEqual([line for line, _, _ in report.errors], [2, 3, 6])
+
+    def test_reads_csv_with_bom_and_mixed_case_header(self):
+        data = "\ufeffFirst_Name,Last_Name,Email,Category\nA,B,a@x.com,10K\n".encode("utf-8")
+        rows = list(read_rows(io.BytesIO(data), "roster.csv"))
+        self.assertEqual(rows, [{"first_name": "A", "last_name": "B", "email": "a@x.com", "category": "10K"}])
+
+    def test_rejects_rows_the_database_would_refuse(self):
+        runners, report = self.validate(
+            [
+                self.row("a@x.com", first_name="A" * 101),
+                self.row("b@x.com", bib_number="-5"),
+                self.row("c@x.com"),
+            ]
+        )
+        self.assertEqual(len(runners), 1)
+        self.assertEqual([line for line, _, _ in report.errors], [2, 3])
+        self.assertIn("first_name", report.errors[0][2])
+        self.assertEqual(report.errors[1][2], "invalid bib '-5'")
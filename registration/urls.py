@@ -0,0 +1,7 @@
+#registration/urls.py
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    path("api/runners/import/", views.import_runners, name="import_runners"),
+]
@@ -1,3 +1,40 @@
-from django.shortcuts import render
+import io
 
-# Create your views here.
+from django.db import IntegrityError
+from django.http import HttpResponse, JsonResponse
+
+from .importer import import_roster
+
+
+def import_runners(request):
+    """
+    POST a roster as multipart ``file``. Returns the import summary as JSON,
+    or the rejected rows as CSV when called with ``?errors=csv``.
+
+    Authorised by the staff session, so the POST must carry the CSRF token
+    (``csrfmiddlewaretoken`` field or ``X-CSRFToken`` header).
+    """
+    if request.method != "POST":
+        return JsonResponse({"error": "POST only"}, status=405)
+    if not request.user.is_staff:
+        return JsonResponse({"error": "staff only"}, status=403)
+
+    upload = request.FILES.get("file")
+    if upload is None:
+        return JsonResponse({"error": "Missing file"}, status=400)
+
+    try:
+        report = import_roster(upload, upload.name, dry_run=request.GET.get("dry_run") == "1")
+    except ValueError as e:
+        return JsonResponse({"error": str(e)}, status=400)
+    except IntegrityError:
+        # validated against a snapshot; a concurrent registration took a bib/email
+        return JsonResponse({"error": "Roster conflicts with runners registered meanwhile, retry"}, status=409)
+
+    if request.GET.get("errors") == "csv":
+        out = io.StringIO()
+        report.write_errors(out)
+        response = HttpResponse(out.getvalue(), content_type="text/csv")
+        response["Content-Disposition"] = 'attachment; filename="import_errors.csv"'
+        return response
+    return JsonResponse(report.as_dict())
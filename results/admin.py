@@ -0,0 +1,15 @@
+# results/admin.py
+from django.contrib import admin
+from .models import CategoryStats, RunnerAnalytics
+
+@admin.register(RunnerAnalytics)
+class RunnerAnalyticsAdmin(admin.ModelAdmin):
+    list_display = ('runner','race','distance_m','elapsed_s','avg_pace_s_per_km','fastest_km_s')
+    list_filter = ('race',)
+    list_select_related = ('runner','race__category')
+    raw_id_fields = ('runner','race')
+
+@admin.register(CategoryStats)
+class CategoryStatsAdmin(admin.ModelAdmin):
+    list_display = ('race','category','runners','finishers','fastest_s','median_pace_s_per_km')
+    list_select_related = ('race__category','category')
@@ -0,0 +1,132 @@
+# results/analytics.py
+"""
+Post-race analytics.
+
+Runners are split into chunks and analysed in a process pool. Each worker
+pulls its runners' traces with one raw query into NumPy arrays, computes
+the metrics vectorized per runner and upserts them with one bulk_create.
+"""
+import numpy as np
+from django.db import connection
+
+from .models import RunnerAnalytics
+
+EARTH_RADIUS_M = 6371000.0
+JITTER_M = 0.5  # same GPS jitter floor as the live tracker
+SPLIT_M = 1000.0
+PACE_WINDOW_M = 500.0
+
+TRACE_SQL = """
+    SELECT runner_id, EXTRACT(EPOCH FROM timestamp), ST_Y(location), ST_X(location)
+    FROM tracking_trackingpoint
+    WHERE race_id = %s AND runner_id = ANY(%s)
+    ORDER BY runner_id, timestamp
+"""
+
+
+def haversine_m(lat1, lon1, lat2, lon2):
+    lat1, lon1, lat2, lon2 = map(np.radians, (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(a))
+
+
+def runner_metrics(t, lat, lon):
+    """Metrics for one trace; ``t`` in epoch seconds, arrays in time order."""
+    t = t - t[0]
+    seg = haversine_m(lat[:-1], lon[:-1], lat[1:], lon[1:])
+    seg[seg <= JITTER_M] = 0.0
+    cum = np.concatenate(([0.0], np.cumsum(seg)))
+    distance = float(cum[-1])
+    elapsed = float(t[-1])
+
+    metrics = {
+        "distance_m": distance,
+        "elapsed_s": elapsed,
+        "avg_pace_s_per_km": elapsed / (distance / 1000) if distance > 0 else None,
+        "fastest_km_s": None,
+        "fastest_km_start_m": None,
+        "splits": [],
+        "pace_curve": [],
+    }
+    if distance < SPLIT_M:
+        return metrics
+
+    # time at each distance mark, interpolated along the cumulative distance
+    marks = np.arange(SPLIT_M, distance + 1e-9, SPLIT_M)
+    metrics["splits"] = np.round(np.interp(marks, cum, t), 1).tolist()
+
+    windows = np.arange(0.0, distance + 1e-9, PACE_WINDOW_M)
+    window_t = np.interp(windows, cum, t)
+    pace = np.diff(window_t) / (PACE_WINDOW_M / 1000)
+    metrics["pace_curve"] = np.round(np.column_stack((windows[1:], pace)), 1).tolist()
+
+    # fastest 1 km starting at any fix
+    starts = cum <= distance - SPLIT_M
+    durations = np.interp(cum[starts] + SPLIT_M, cum, t) - t[starts]
+    best = int(np.argmin(durations))
+    metrics["fastest_km_s"] = round(float(durations[best]), 1)
+    metrics["fastest_km_start_m"] = round(float(cum[starts][best]), 1)
+    return metrics
+
+
+def load_traces(race_id, runner_ids):
+    """``{runner_id: (t, lat, lon)}`` for the given runners, one query."""
+    with connection.cursor() as cursor:
+        cursor.execute(TRACE_SQL, [race_id, list(runner_ids)])
+        rows = cursor.fetchall()
+    if not rows:
+        return {}
+    data = np.array(rows, dtype=float)
+    ids, starts = np.unique(data[:, 0], return_index=True)
+    bounds = list(starts[1:]) + [len(data)]
+    return {
+        int(rid): (data[s:e, 1], data[s:e, 2], data[s:e, 3])
+        for rid, s, e in zip(ids, starts, bounds)
+    }
+
+
+def analyse_chunk(race_id, runner_ids, write=True):
+    """
+    Worker entry point. Returns ``(runner_id, distance_m, elapsed_s,
+    avg_pace_s_per_km)`` per analysed runner for the category stats.
+    """
+    rows = []
+    summary = []
+    for runner_id, (t, lat, lon) in load_traces(race_id, runner_ids).items():
+        if len(t) < 2:
+            continue
+        m = runner_metrics(t, lat, lon)
+        rows.append(RunnerAnalytics(race_id=race_id, runner_id=runner_id, **m))
+        summary.append((runner_id, m["distance_m"], m["elapsed_s"], m["avg_pace_s_per_km"]))
+    if write and rows:
+        RunnerAnalytics.objects.bulk_create(
+            rows,
+            update_conflicts=True,
+            unique_fields=["race", "runner"],
+            update_fields=[
+                "distance_m", "elapsed_s", "avg_pace_s_per_km", "fastest_km_s",
+                "fastest_km_start_m", "splits", "pace_curve", "computed_at",
+            ],
+        )
+    connection.close()
+    return summary
+
+
+def category_stats(summary, course_m):
+    """Aggregate the per-runner summaries of one race category."""
+    if not summary:
+        return {"runners": 0, "finishers": 0}
+    distance = np.array([s[1] for s in summary])
+    elapsed = np.array([s[2] for s in summary])
+    pace = np.array([np.nan if s[3] is None else s[3] for s in summary], dtype=float)
+    finished = distance >= course_m
+    pace = pace[~np.isnan(pace)]
+    p10, median, p90 = np.percentile(pace, [10, 50, 90]) if len(pace) else (None, None, None)
+    return {
+        "runners": len(summary),
+        "finishers": int(finished.sum()),
+        "fastest_s": float(elapsed[finished].min()) if finished.any() else None,
+        "median_pace_s_per_km": None if median is None else float(median),
+        "p10_pace_s_per_km": None if p10 is None else float(p10),
+        "p90_pace_s_per_km": None if p90 is None else float(p90),
+    }
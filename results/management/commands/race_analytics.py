@@ -0,0 +1,90 @@
+# results/management/commands/race_analytics.py
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import django
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from core.models import Race
+from results.analytics import analyse_chunk, category_stats
+from results.models import CategoryStats
+from tracking.models import TrackingPoint
+
+
+def _init_worker():
+    # Forked workers inherit a configured Django; spawned ones need setup.
+    from django.apps import apps
+    if not apps.ready:
+        django.setup()
+
+
+class Command(BaseCommand):
+    help = "Compute post-race splits, pace curves, fastest segments and category stats in a process pool"
+
+    def add_arguments(self, parser):
+        parser.add_argument("race_id", type=int)
+        parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+        parser.add_argument("--chunk-size", type=int, default=200, help="Runners per worker task")
+        parser.add_argument(
+            "--benchmark",
+            help="Comma-separated worker counts, e.g. 1,2,4,8: time the compute phase for each "
+                 "(nothing is written)",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            race = Race.objects.select_related("category").get(pk=options["race_id"])
+        except Race.DoesNotExist:
+            raise CommandError(f"Race {options['race_id']} does not exist")
+        runner_ids = list(
+            TrackingPoint.objects.filter(race=race).order_by("runner_id")
+            .values_list("runner_id", flat=True).distinct()
+        )
+        if not runner_ids:
+            self.stdout.write("No tracking points for this race.")
+            return
+        size = max(options["chunk_size"], 1)
+        chunks = [runner_ids[i:i + size] for i in range(0, len(runner_ids), size)]
+
+        if options["benchmark"]:
+            self.benchmark(race, chunks, [int(n) for n in options["benchmark"].split(",")])
+            return
+
+        started = time.perf_counter()
+        summary = self.run(race, chunks, options["workers"], write=True, progress=True)
+        stats = category_stats(summary, race.category.distance_km * 1000)
+        CategoryStats.objects.update_or_create(race=race, category=race.category, defaults=stats)
+        self.stdout.write(self.style.SUCCESS(
+            f"Analysed {len(summary)} runners ({stats['finishers']} finishers) with "
+            f"{options['workers']} workers in {time.perf_counter() - started:.1f}s"
+        ))
+
+    def run(self, race, chunks, workers, write, progress=False):
+        # Workers must open their own DB connections, never share the parent's.
+        connections.close_all()
+        total = sum(len(c) for c in chunks)
+        done = 0
+        summary = []
+        started = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+            futures = {pool.submit(analyse_chunk, race.id, chunk, write): len(chunk) for chunk in chunks}
+            for future in as_completed(futures):
+                summary.extend(future.result())
+                done += futures[future]
+                if progress:
+                    self.stdout.write(
+                        f"  {done}/{total} runners ({100 * done // total}%) "
+                        f"{time.perf_counter() - started:.1f}s"
+                    )
+        return summary
+
+    def benchmark(self, race, chunks, worker_counts):
+        self.stdout.write(f"{len(chunks)} chunks, compute only (nothing written)")
+        first = None
+        for n in worker_counts:
+            started = time.perf_counter()
+            self.run(race, chunks, n, write=False)
+            elapsed = time.perf_counter() - started
+            first = first or elapsed
+            self.stdout.write(f"  workers={n:<3} {elapsed:8.2f}s  x{first / elapsed:.2f} vs workers={worker_counts[0]}")
@@ -0,0 +1,55 @@
+# Generated by Django 4.2 on 2026-10-19 17:07
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('registration', '0003_runner_search_trigram_indexes'),
+        ('core', '0002_race_lifecycle'),
+        ('results', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RunnerAnalytics',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('distance_m', models.FloatField()),
+                ('elapsed_s', models.FloatField()),
+                ('avg_pace_s_per_km', models.FloatField(blank=True, null=True)),
+                ('fastest_km_s', models.FloatField(blank=True, null=True)),
+                ('fastest_km_start_m', models.FloatField(blank=True, null=True)),
+                ('splits', models.JSONField(default=list)),
+                ('pace_curve', models.JSONField(default=list)),
+                ('computed_at', models.DateTimeField(auto_now=True)),
+                ('race', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='core.race')),
+                ('runner', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='registration.runner')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='CategoryStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('runners', models.PositiveIntegerField()),
+                ('finishers', models.PositiveIntegerField()),
+                ('fastest_s', models.FloatField(blank=True, null=True)),
+                ('median_pace_s_per_km', models.FloatField(blank=True, null=True)),
+                ('p10_pace_s_per_km', models.FloatField(blank=True, null=True)),
+                ('p90_pace_s_per_km', models.FloatField(blank=True, null=True)),
+                ('computed_at', models.DateTimeField(auto_now=True)),
+                ('category', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='registration.racecategory')),
+                ('race', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='core.race')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='runneranalytics',
+            constraint=models.UniqueConstraint(fields=('race', 'runner'), name='runneranalytics_race_runner_uniq'),
+        ),
+        migrations.AddConstraint(
+            model_name='categorystats',
+            constraint=models.UniqueConstraint(fields=('race', 'category'), name='categorystats_race_category_uniq'),
+        ),
+    ]
@@ -1,5 +1,5 @@
 from django.db import models
-from registration.models import Runner
+from registration.models import Runner, RaceCategory
 from core.models import Race
 
 class Result(models.Model):
@@ -10,3 +10,45 @@ class Result(models.Model):
 
     def __str__(self):
         return f"{self.runner} - {self.race} - {self.finish_time}"
+
+
+class RunnerAnalytics(models.Model):
+    """Post-race metrics per runner, materialized by the race_analytics command."""
+    runner = models.ForeignKey(Runner, on_delete=models.CASCADE)
+    race = models.ForeignKey(Race, on_delete=models.CASCADE)
+    distance_m = models.FloatField()
+    elapsed_s = models.FloatField()
+    avg_pace_s_per_km = models.FloatField(null=True, blank=True)
+    fastest_km_s = models.FloatField(null=True, blank=True)
+    fastest_km_start_m = models.FloatField(null=True, blank=True)
+    splits = models.JSONField(default=list)  # elapsed seconds at each full km
+    pace_curve = models.JSONField(default=list)  # [distance_m, pace_s_per_km] per window
+    computed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['race', 'runner'], name='runneranalytics_race_runner_uniq'),
+        ]
+
+    def __str__(self):
+        return f"{self.runner} - {self.race} analytics"
+
+
+class CategoryStats(models.Model):
+    race = models.ForeignKey(Race, on_delete=models.CASCADE)
+    category = models.ForeignKey(RaceCategory, on_delete=models.CASCADE)
+    runners = models.PositiveIntegerField()
+    finishers = models.PositiveIntegerField()
+    fastest_s = models.FloatField(null=True, blank=True)
+    median_pace_s_per_km = models.FloatField(null=True, blank=True)
+    p10_pace_s_per_km = models.FloatField(null=True, blank=True)
+    p90_pace_s_per_km = models.FloatField(null=True, blank=True)
+    computed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['race', 'category'], name='categorystats_race_category_uniq'),
+        ]
+
+    def __str__(self):
+        return f"{self.category} stats for {self.race}"
@@ -1,3 +1,45 @@
-from django.test import TestCase
+import numpy as np
+from django.test import SimpleTestCase
 
-# Create your tests here.
+from .analytics import category_stats, runner_metrics
+
+# one degree of longitude on the equator, in metres (haversine, R = 6371 km)
+M_PER_DEG = 6371000.0 * np.pi / 180
+
+
+class RunnerMetricsTests(SimpleTestCase):
+    def trace(self, speeds_m_per_s, step_s=10):
+        """A runner heading east along the equator at the given speed per step."""
+        t = np.arange(len(speeds_m_per_s) + 1) * float(step_s)
+        lon = np.concatenate(([0.0], np.cumsum(np.array(speeds_m_per_s) * step_s))) / M_PER_DEG
+        return t, np.zeros_like(lon), lon
+
+    def test_even_pace_gives_even_splits(self):
+        t, lat, lon = self.trace([4.0] * 75)  # 3 km at 250 s/km
+        m = runner_metrics(t, lat, lon)
+        self.assertAlmostEqual(m["distance_m"], 3000, delta=0.5)
+        self.assertEqual(m["splits"], [250.0, 500.0, 750.0])
+        self.assertAlmostEqual(m["avg_pace_s_per_km"], 250, delta=0.1)
+        self.assertAlmostEqual(m["fastest_km_s"], 250, delta=0.1)
+        self.assertEqual(len(m["pace_curve"]), 6)
+
+    def test_fastest_km_finds_the_fast_segment(self):
+        t, lat, lon = self.trace([2.0] * 50 + [5.0] * 20 + [2.0] * 50)  # slow 1 km, fast 1 km, slow 1 km
+        m = runner_metrics(t, lat, lon)
+        self.assertAlmostEqual(m["fastest_km_s"], 200, delta=0.5)
+        self.assertAlmostEqual(m["fastest_km_start_m"], 1000, delta=0.5)
+
+    def test_short_trace_has_no_splits(self):
+        t, lat, lon = self.trace([3.0] * 10)
+        m = runner_metrics(t, lat, lon)
+        self.assertEqual(m["splits"], [])
+        self.assertIsNone(m["fastest_km_s"])
+
+
+class CategoryStatsTests(SimpleTestCase):
+    def test_aggregates_finishers_and_pace_percentiles(self):
+        summary = [(1, 5000, 1500, 300), (2, 5000, 1250, 250), (3, 2000, 900, 450), (4, 0, 10, None)]
+        stats = category_stats(summary, course_m=5000)
+        self.assertEqual((stats["runners"], stats["finishers"]), (4, 2))
+        self.assertEqual(stats["fastest_s"], 1250)
+        self.assertEqual(stats["median_pace_s_per_km"], 300)
@@ -4,6 +4,15 @@ set -e  # Exit immediately if a command fails
 PORT=${PORT:-8000}
 echo "🚀 Starting Django + Daphne on port $PORT"
 
+# APP_PROFILE=ingest boots the slim ingest-only app (tracking API + spectator
+# sockets, no admin/DRF/celery beat). Migrations and static files are left
+# to the full profile, so these pods go straight to Daphne.
+if [ "${APP_PROFILE:-full}" = "ingest" ]; then
+  export DJANGO_SETTINGS_MODULE=race_management.settings_ingest
+  echo "🚀 Launching ingest-only Daphne on port $PORT..."
+  exec daphne -b 0.0.0.0 -p "$PORT" race_management.asgi_ingest:application
+fi
+
 # Create a flag file so setup runs only once
 SETUP_FLAG="/app/.setup_done"
 
@@ -44,6 +53,9 @@ else
   echo "⚡ Django setup already done, skipping migrations and collectstatic."
 fi
 
+# Retry race lifecycle jobs lost with a previous pod; runs them in the background
+python manage.py sweep_race_jobs &
+
 # 4️⃣ Start Daphne
 echo "🚀 Launching Daphne on port $PORT..."
 exec daphne -b 0.0.0.0 -p "$PORT" race_management.asgi:application
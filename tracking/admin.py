@@ -1,11 +1,55 @@
 # tracking/admin.py
 from django.contrib import admin
+from django.template.response import TemplateResponse
+from django.utils.html import format_html
+from core.paginators import EstimatedCountPaginator
 from .models import TrackingPoint
-from registration.models import Runner
-from core.models import Race
 
 @admin.register(TrackingPoint)
 class TrackingPointAdmin(admin.ModelAdmin):
-    list_display = ('runner', 'race', 'location', 'timestamp' if hasattr(TrackingPoint, 'timestamp') else 'recorded_at')
-    list_filter = ('race',)
-    readonly_fields = ('timestamp' if hasattr(TrackingPoint, 'timestamp') else 'recorded_at',)
+    list_display = ('id', 'runner', 'race', 'coordinates', 'timestamp')
+    list_filter = ('race', ('timestamp', admin.DateFieldListFilter))
+    list_select_related = ('runner', 'race__category')
+    raw_id_fields = ('runner', 'race')
+    readonly_fields = ('timestamp',)
+    # Newest first by primary key so "older" pages can be fetched by keyset
+    # (``?before=<id>``) instead of a deep OFFSET.
+    ordering = ('-id',)
+    sortable_by = ()
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    @admin.display(description='location')
+    def coordinates(self, obj):
+        # Plain text plus a link; the map is only loaded when someone clicks it.
+        lat, lon = obj.location.y, obj.location.x
+        return format_html(
+            '{:.6f}, {:.6f} <a href="https://www.openstreetmap.org/?mlat={}&mlon={}#map=17/{}/{}" '
+            'target="_blank" rel="noopener">map</a>',
+            lat, lon, lat, lon, lat, lon,
+        )
+
+    def get_queryset(self, request):
+        qs = super().get_queryset(request)
+        before = getattr(request, 'keyset_before', None)
+        if before is not None:
+            qs = qs.filter(pk__lt=before)
+        return qs
+
+    def changelist_view(self, request, extra_context=None):
+        # ChangeList rejects unknown query parameters, so take the keyset
+        # cursor off the querystring before it gets there.
+        if 'before' in request.GET:
+            params = request.GET.copy()
+            before = params.pop('before')[-1]
+            request.GET = params
+            request.keyset_before = int(before) if before.isdigit() else None
+
+        response = super().changelist_view(request, extra_context)
+        if isinstance(response, TemplateResponse) and 'cl' in response.context_data:
+            cl = response.context_data['cl']
+            rows = list(cl.result_list)
+            if len(rows) == cl.list_per_page:
+                response.context_data['keyset_next'] = cl.get_query_string({'before': rows[-1].pk}, ['p'])
+            response.context_data['keyset_active'] = getattr(request, 'keyset_before', None) is not None
+        return response
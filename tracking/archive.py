@@ -0,0 +1,20 @@
+# tracking/archive.py
+import csv
+
+from django.utils import timezone
+
+
+def export_and_delete(qs, prefix="trackingpoints"):
+    """Write the points in ``qs`` to a CSV under /tmp, delete them, return (count, path)."""
+    ts = timezone.now().strftime("%Y%m%d%H%M%S")
+    fname = f"/tmp/{prefix}_{ts}.csv"
+    count = 0
+    with open(fname, "w", newline="") as f:
+        w = csv.writer(f)
+        w.writerow(["race_id", "runner_id", "lon", "lat", "timestamp"])
+        for p in qs.iterator():
+            w.writerow([p.race_id, p.runner_id, p.location.x, p.location.y, p.timestamp.isoformat()])
+            count += 1
+    # TODO: upload fname to S3 / object storage if required
+    qs.delete()
+    return count, fname
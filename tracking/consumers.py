@@ -1,26 +1,194 @@
 # tracking/consumers.py
-import json
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+
+from channels.db import database_sync_to_async
 from channels.generic.websocket import AsyncJsonWebsocketConsumer
+from django.conf import settings
+
+from .sync import delta_since
+
+logger = logging.getLogger(__name__)
+
+# Close code sent to spectators that could not keep up with the race feed.
+SLOW_CONSUMER_CLOSE_CODE = 4008
+
+# Outbox key of the heartbeat; a pending ping is replaced silently, not
+# counted as a conflated update.
+PING_KEY = "ping"
+
+# Process-wide backpressure counters (summed over every connected spectator),
+# served by tracking.views.ws_stats.
+stats = {"open": 0, "conflated": 0, "dropped": 0, "slow_disconnects": 0}
+
+
+class RaceOutbox:
+    """
+    Bounded per-connection buffer that keeps only the newest message per key.
+
+    Updates for a runner that is still waiting to be sent replace the pending
+    message in place (conflation). When the buffer holds ``maxsize`` distinct
+    keys the oldest pending message is dropped to make room.
+    """
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.conflated = 0
+        self.dropped = 0
+        self._items = OrderedDict()
+        self._ready = asyncio.Event()
+        self._backlog_since = None
+        self._anon = 0
+
+    def __len__(self):
+        return len(self._items)
+
+    def put(self, key, message):
+        if key is None:
+            # messages without a runner are never conflated
+            self._anon += 1
+            key = ("anon", self._anon)
+        if key in self._items:
+            self._items[key] = message
+            if key != PING_KEY:
+                self.conflated += 1
+                stats["conflated"] += 1
+        else:
+            if len(self._items) >= self.maxsize:
+                self._items.popitem(last=False)
+                self.dropped += 1
+                stats["dropped"] += 1
+            self._items[key] = message
+        if self._backlog_since is None:
+            self._backlog_since = time.monotonic()
+        self._ready.set()
+
+    async def get(self):
+        while not self._items:
+            self._ready.clear()
+            await self._ready.wait()
+        _, message = self._items.popitem(last=False)
+        if not self._items:
+            self._backlog_since = None
+        return message
+
+    def backlog_age(self):
+        """Seconds the outbox has been continuously non-empty (0 when empty)."""
+        if self._backlog_since is None:
+            return 0.0
+        return time.monotonic() - self._backlog_since
+
+    def clear(self):
+        self.dropped += len(self._items)
+        stats["dropped"] += len(self._items)
+        self._items.clear()
+        self._backlog_since = None
+
 
 class RaceTrackerConsumer(AsyncJsonWebsocketConsumer):
+    """
+    Spectator feed for one race.
+
+    A stalled client is detected two ways. ``send_json`` is bounded by
+    TRACKING_WS_SEND_TIMEOUT, which only helps on servers whose ASGI ``send``
+    waits for the socket to drain; Daphne's returns at once and buffers in
+    the transport. So every TRACKING_WS_PING_INTERVAL seconds a ping is also
+    queued behind the pending updates. The pong deadline is opt-in: once a
+    client has answered with ``{"cmd": "pong"}``, it is closed if it then
+    goes TRACKING_WS_STALL_TIMEOUT seconds without one. Clients that never
+    pong (older dashboards, other consumers) are left to Daphne's protocol
+    ping timeout and the outbox backlog-age check.
+    """
+
     async def connect(self):
         self.race_id = self.scope['url_route']['kwargs']['race_id']
         self.group_name = f"race_{self.race_id}"
+        self.outbox = RaceOutbox(getattr(settings, "TRACKING_WS_OUTBOX_SIZE", 1000))
+        self.send_timeout = getattr(settings, "TRACKING_WS_SEND_TIMEOUT", 5.0)
+        self.stall_timeout = getattr(settings, "TRACKING_WS_STALL_TIMEOUT", 15.0)
+        self.ping_interval = getattr(settings, "TRACKING_WS_PING_INTERVAL", 5.0)
+        self._writer = None
+        self._heartbeat = None
+        self._slow = False
+        self._last_pong = None  # set by the first pong; enables the deadline
+        stats["open"] += 1
         await self.channel_layer.group_add(self.group_name, self.channel_name)
         await self.accept()
         await self.send_json({"type": "info", "message": f"Connected to race {self.race_id}"})
+        self._writer = asyncio.ensure_future(self._drain_outbox())
+        if self.ping_interval:
+            self._heartbeat = asyncio.ensure_future(self._ping_loop())
 
     async def disconnect(self, close_code):
+        for task in (self._writer, self._heartbeat):
+            if task is not None:
+                task.cancel()
+        stats["open"] -= 1
         await self.channel_layer.group_discard(self.group_name, self.channel_name)
 
     # Channels maps "type": "race_update" -> method name "race_update"
     async def race_update(self, event):
-        # event contains 'message'
-        await self.send_json(event.get("message"))
+        # Never await the socket here: a stalled client would block the
+        # channel-layer receive loop and let the layer buffer pile up.
+        if self._slow:
+            return
+        message = event.get("message")
+        key = message.get("runner_id") if isinstance(message, dict) else None
+        self.outbox.put(key, message)
+        if self.outbox.backlog_age() > self.stall_timeout:
+            await self._drop_slow_consumer("backlog")
+
+    async def race_eta(self, event):
+        # Whole-field ETA snapshots supersede each other: keep only the newest.
+        if not self._slow:
+            self.outbox.put("eta", event.get("message"))
+
+    async def _drain_outbox(self):
+        try:
+            while True:
+                message = await self.outbox.get()
+                await asyncio.wait_for(self.send_json(message), self.send_timeout)
+        except asyncio.TimeoutError:
+            await self._drop_slow_consumer("send timed out")
+
+    async def _ping_loop(self):
+        while True:
+            await asyncio.sleep(self.ping_interval)
+            if self._last_pong is not None and time.monotonic() - self._last_pong > self.stall_timeout:
+                await self._drop_slow_consumer("no pong")
+                return
+            self.outbox.put(PING_KEY, {"type": "ping"})
+
+    async def _drop_slow_consumer(self, reason):
+        if self._slow:
+            return
+        self._slow = True
+        stats["slow_disconnects"] += 1
+        logger.warning(
+            "closing slow spectator on race %s (%s, %d pending); totals %s",
+            self.race_id, reason, len(self.outbox), stats,
+        )
+        self.outbox.clear()
+        for task in (self._writer, self._heartbeat):
+            if task is not None and task is not asyncio.current_task():
+                task.cancel()
+        await self.close(code=SLOW_CONSUMER_CLOSE_CODE)
 
-    # Keep this handler if you want to accept messages from clients
+    # Clients resume with {"cmd": "sync", "cursor": <last cursor seen>};
+    # "get_last" is a full snapshot (cursor 0).
     async def receive_json(self, content):
         cmd = content.get("cmd")
-        if cmd == "get_last":
-            # optional: implement last positions fetch
-            await self.send_json({"type": "info", "message": "server: get_last not implemented"})
+        if cmd == "pong":
+            self._last_pong = time.monotonic()
+            return
+        if cmd in ("sync", "get_last"):
+            try:
+                cursor = int(content.get("cursor") or 0) if cmd == "sync" else 0
+            except (TypeError, ValueError):
+                await self.send_json({"type": "info", "message": "server: cursor must be an integer"})
+                return
+            delta = await database_sync_to_async(delta_since)(int(self.race_id), cursor)
+            # queued behind pending updates so the client sees them in order
+            self.outbox.put(None, delta)
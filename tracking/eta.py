@@ -0,0 +1,156 @@
+# tracking/eta.py
+"""
+Pace prediction / ETA engine.
+
+Each runner has a small state in the cache (Redis in production): last fix,
+cumulative distance and an exponentially smoothed pace. The ingest path
+advances it one fix at a time, so neither ETAs nor the running distance
+need the raw TrackingPoint history. ETAs for the whole field are computed
+in one vectorized NumPy pass over those states.
+"""
+import math
+import time
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.core.cache import cache
+
+from registration.models import Runner
+from .broadcast import broadcast_to_race_sync
+from .queries import runner_trace
+
+JITTER_M = 0.5  # ignore GPS jitter below this many metres
+EARTH_RADIUS_M = 6371000.0  # same sphere as results.analytics.haversine_m
+STATE_TTL = 24 * 3600
+
+
+def _alpha():
+    return getattr(settings, "TRACKING_ETA_ALPHA", 0.3)
+
+
+def state_key(race_id, runner_id):
+    return f"eta:{race_id}:{runner_id}"
+
+
+def haversine_m(lat1, lon1, lat2, lon2):
+    """Great-circle distance in metres; stdlib math keeps ingest import-light."""
+    lat1, lon1, lat2, lon2 = map(math.radians, (lat1, lon1, lat2, lon2))
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_M * math.asin(math.sqrt(a))
+
+
+def advance(state, lat, lon, t, alpha=None):
+    """Return ``state`` moved forward by one fix (``t`` in epoch seconds)."""
+    if state is None:
+        return {"lat": lat, "lon": lon, "t": t, "start_t": t, "distance_m": 0.0, "pace_s_per_m": None}
+    if t <= state["t"]:
+        return state  # stale or duplicate fix
+    segment = haversine_m(state["lat"], state["lon"], lat, lon)
+    if segment <= JITTER_M:
+        return {**state, "t": t}
+    seg_pace = (t - state["t"]) / segment
+    prev = state["pace_s_per_m"]
+    alpha = _alpha() if alpha is None else alpha
+    pace = seg_pace if prev is None else alpha * seg_pace + (1 - alpha) * prev
+    return {
+        **state,
+        "lat": lat, "lon": lon, "t": t,
+        "distance_m": state["distance_m"] + segment,
+        "pace_s_per_m": pace,
+    }
+
+
+def rebuild(race_id, runner_id):
+    """Replay a runner's stored trace; used once when the cache has no state."""
+    state = None
+    for p in runner_trace(race_id, runner_id).only("location", "timestamp"):
+        state = advance(state, p.location.y, p.location.x, p.timestamp.timestamp())
+    return state
+
+
+def update(race_id, runner_id, lat, lon, t):
+    """Fold a new (already stored) fix into the runner's state and return it."""
+    return update_many(race_id, runner_id, [(lat, lon, t)])
+
+
+def update_many(race_id, runner_id, fixes):
+    """
+    Fold a batch of stored ``(lat, lon, t)`` fixes in time order with one
+    cache read and write. A batch reaching back before the state (a late
+    offline upload) replays the stored trace instead, so the late fixes
+    count towards distance and pace.
+    """
+    key = state_key(race_id, runner_id)
+    state = cache.get(key)
+    if state is None or min(t for _, _, t in fixes) < state["t"]:
+        state = rebuild(race_id, runner_id)
+    for lat, lon, t in sorted(fixes, key=lambda f: f[2]):
+        state = advance(state, lat, lon, t)
+    cache.set(key, state, STATE_TTL)
+    return state
+
+
+def roster_key(race_id):
+    return f"eta:{race_id}:roster"
+
+
+def race_roster(race):
+    """Runner ids of ``race``; primed into the cache by the race warm-up job."""
+    ids = cache.get(roster_key(race.id))
+    if ids is None:
+        ids = list(Runner.objects.filter(category_id=race.category_id).values_list("id", flat=True))
+        cache.set(roster_key(race.id), ids, STATE_TTL)
+    return ids
+
+
+def compute_etas(distance_m, pace_s_per_m, last_t, target_m):
+    """
+    Vectorized ETA: arrays in, epoch-second ETAs out (NaN when unknown or
+    already past ``target_m``).
+    """
+    import numpy as np
+    remaining = target_m - distance_m
+    eta = last_t + remaining * pace_s_per_m
+    eta[(remaining < 0) | ~np.isfinite(pace_s_per_m)] = np.nan
+    return eta
+
+
+def field_etas(race, at_km=None):
+    """ETA at ``at_km`` (default: the finish) for every runner of ``race``."""
+    import numpy as np
+    course_m = race.category.distance_km * 1000
+    target_m = at_km * 1000 if at_km is not None else course_m
+    runner_ids = race_roster(race)
+    states = cache.get_many([state_key(race.id, rid) for rid in runner_ids])
+
+    rows = [(rid, states[state_key(race.id, rid)]) for rid in runner_ids if state_key(race.id, rid) in states]
+    if rows:
+        distance = np.array([s["distance_m"] for _, s in rows], dtype=float)
+        pace = np.array([np.nan if s["pace_s_per_m"] is None else s["pace_s_per_m"] for _, s in rows], dtype=float)
+        last_t = np.array([s["t"] for _, s in rows], dtype=float)
+        eta = compute_etas(distance, pace, last_t, target_m)
+    now = time.time()
+
+    runners = []
+    for i, (rid, _) in enumerate(rows):
+        known = not np.isnan(eta[i])
+        runners.append({
+            "runner_id": rid,
+            "distance_m": round(float(distance[i]), 1),
+            "progress": round(min(float(distance[i]) / course_m, 1.0), 4) if course_m else None,
+            "pace_s_per_km": round(float(pace[i]) * 1000, 1) if np.isfinite(pace[i]) else None,
+            "eta": datetime.fromtimestamp(eta[i], dt_timezone.utc).isoformat() if known else None,
+            "eta_in_s": round(float(eta[i]) - now) if known else None,
+            "passed": bool(distance[i] >= target_m),
+        })
+    return {"type": "eta", "race_id": race.id, "at_m": target_m, "runners": runners}
+
+
+def maybe_push(race):
+    """
+    Broadcast finish ETAs on the race group, at most once per
+    TRACKING_ETA_PUSH_INTERVAL seconds per race across all workers.
+    """
+    interval = getattr(settings, "TRACKING_ETA_PUSH_INTERVAL", 5)
+    if cache.add(f"eta:{race.id}:pushed", 1, interval):
+        broadcast_to_race_sync(race.id, field_etas(race), msg_type="race_eta")
@@ -0,0 +1,34 @@
+# tracking/lifecycle.py
+"""Race lifecycle job handlers owned by the tracking app (see core.jobs)."""
+from django.core.cache import cache
+
+from core.jobs import register
+from . import eta
+from .archive import export_and_delete
+from .broadcast import broadcast_to_race_sync
+from .models import TrackingPoint
+
+
+@register("warmup")
+def warm_up(race):
+    """Prime the roster and any existing runner states before the start gun."""
+    cache.delete(eta.roster_key(race.id))
+    for runner_id in eta.race_roster(race):
+        key = eta.state_key(race.id, runner_id)
+        if cache.get(key) is None:
+            state = eta.rebuild(race.id, runner_id)
+            if state is not None:
+                cache.set(key, state, eta.STATE_TTL)
+
+
+@register("teardown")
+def tear_down(race):
+    """Send the final ETA snapshot and drop the race's live state."""
+    broadcast_to_race_sync(race.id, eta.field_etas(race), msg_type="race_eta")
+    keys = [eta.state_key(race.id, runner_id) for runner_id in eta.race_roster(race)]
+    cache.delete_many(keys + [eta.roster_key(race.id), f"eta:{race.id}:pushed"])
+
+
+@register("archive")
+def archive(race):
+    export_and_delete(TrackingPoint.objects.filter(race=race), prefix=f"race{race.id}_trackingpoints")
@@ -0,0 +1,102 @@
+# tracking/management/commands/explain_hot_queries.py
+import json
+from datetime import timedelta
+
+from django.contrib.gis.geos import Polygon
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+from tracking.models import TrackingPoint
+from tracking.queries import last_points, runner_trace
+
+# Indexes added for the hot paths; --compare drops them to get "before" numbers.
+HOT_PATH_INDEXES = [
+    "trackpoint_race_id_idx",
+    "trackpoint_race_runner_ts_idx",
+    "trackpoint_ts_brin",
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "Run EXPLAIN ANALYZE on the hot TrackingPoint queries and report timings. "
+        "--compare also measures them with the hot-path indexes dropped inside a "
+        "rolled-back transaction; that holds an exclusive lock on the table, so use it on staging."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--race", type=int, help="Race id (default: race of the newest point)")
+        parser.add_argument("--runner", type=int, help="Runner id (default: runner of the newest point)")
+        parser.add_argument("--runs", type=int, default=3, help="Repetitions per query; the best run is reported")
+        parser.add_argument("--compare", action="store_true", help="Also measure without the hot-path indexes")
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql":
+            raise CommandError("EXPLAIN ANALYZE timings are only meaningful on PostgreSQL/PostGIS")
+
+        newest = TrackingPoint.objects.order_by("-id").first()
+        if newest is None:
+            raise CommandError("No tracking points to benchmark.")
+        race_id = options["race"] or newest.race_id
+        runner_id = options["runner"] or newest.runner_id
+        queries = self.hot_queries(race_id, runner_id, newest)
+
+        after = self.measure(queries, options["runs"])
+        before = None
+        if options["compare"]:
+            with transaction.atomic():
+                with connection.cursor() as cursor:
+                    for name in HOT_PATH_INDEXES:
+                        cursor.execute(f'DROP INDEX IF EXISTS "{name}"')
+                before = self.measure(queries, options["runs"])
+                transaction.set_rollback(True)
+
+        self.stdout.write(f"race={race_id} runner={runner_id} runs={options['runs']}")
+        for label, (ms, node) in after.items():
+            line = f"{label:<28} {ms:>10.2f} ms  {node}"
+            if before:
+                old_ms, old_node = before[label]
+                speedup = old_ms / ms if ms else float("inf")
+                line += f"   | without indexes {old_ms:>10.2f} ms  {old_node}  (x{speedup:.1f})"
+            self.stdout.write(line)
+
+    def hot_queries(self, race_id, runner_id, newest):
+        x, y = newest.location.x, newest.location.y
+        bbox = Polygon.from_bbox((x - 0.01, y - 0.01, x + 0.01, y + 0.01))
+        bbox.srid = newest.location.srid
+        since = timezone.now() - timedelta(hours=1)
+        return {
+            "post_location trace": runner_trace(race_id, runner_id),
+            "dashboard last points": last_points(race_id),
+            "admin race page": TrackingPoint.objects.filter(race_id=race_id).order_by("-id")[:100],
+            "admin last hour": TrackingPoint.objects.filter(timestamp__gte=since).order_by("-id")[:100],
+            "spatial bbox (GiST)": TrackingPoint.objects.filter(race_id=race_id, location__bboverlaps=bbox),
+        }
+
+    def measure(self, queries, runs):
+        results = {}
+        with connection.cursor() as cursor:
+            for label, qs in queries.items():
+                sql, params = qs.query.sql_with_params()
+                best = None
+                for _ in range(max(runs, 1)):
+                    cursor.execute("EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) " + sql, params)
+                    plan = cursor.fetchone()[0]
+                    if isinstance(plan, str):
+                        plan = json.loads(plan)
+                    total = plan[0]["Planning Time"] + plan[0]["Execution Time"]
+                    if best is None or total < best[0]:
+                        best = (total, self.describe(plan[0]["Plan"]))
+                results[label] = best
+        return results
+
+    def describe(self, node):
+        """Name the access paths in a plan, e.g. 'Index Scan using x'."""
+        scans = []
+        stack = [node]
+        while stack:
+            n = stack.pop()
+            if "Scan" in n["Node Type"]:
+                scans.append(f"{n['Node Type']} {n.get('Index Name', '')}".strip())
+            stack.extend(n.get("Plans", []))
+        return ", ".join(scans)
@@ -0,0 +1,21 @@
+# Generated by Django 4.2 on 2026-10-19 12:01
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run in a transaction; building it
+    # this way keeps GPS ingest writing to the table during the deploy.
+    atomic = False
+
+    dependencies = [
+        ('tracking', '0002_alter_trackingpoint_options_and_more'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='trackingpoint',
+            index=models.Index(fields=['race', 'id'], name='trackpoint_race_id_idx'),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 4.2 on 2026-10-19 12:40
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    # Concurrent builds cannot run in a transaction; ingest keeps writing.
+    atomic = False
+
+    dependencies = [
+        ('tracking', '0003_trackingpoint_race_id_idx'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='trackingpoint',
+            options={},
+        ),
+        AddIndexConcurrently(
+            model_name='trackingpoint',
+            index=models.Index(fields=['race', 'runner', '-timestamp'], name='trackpoint_race_runner_ts_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='trackingpoint',
+            index=django.contrib.postgres.indexes.BrinIndex(autosummarize=True, fields=['timestamp'], name='trackpoint_ts_brin'),
+        ),
+        # Every index above leads with race, so the FK's own index is redundant.
+        migrations.AlterField(
+            model_name='trackingpoint',
+            name='race',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='core.race'),
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 4.2 on 2026-10-19 18:20
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+    # The unique index is built CONCURRENTLY, which cannot run in a
+    # transaction; ingest keeps writing to the table meanwhile.
+    atomic = False
+
+    dependencies = [
+        ('tracking', '0004_trackingpoint_hot_query_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='trackingpoint',
+            name='timestamp',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.AddField(
+            model_name='trackingpoint',
+            name='device_id',
+            field=models.CharField(blank=True, default='', max_length=64),
+        ),
+        migrations.AddField(
+            model_name='trackingpoint',
+            name='seq',
+            field=models.PositiveBigIntegerField(blank=True, null=True),
+        ),
+        # A partial UniqueConstraint is a unique index in PostgreSQL; build
+        # that index concurrently and record the constraint in the state.
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunSQL(
+                    'CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS "trackpoint_device_seq_uniq" '
+                    'ON "tracking_trackingpoint" ("runner_id", "device_id", "seq") WHERE "seq" IS NOT NULL',
+                    'DROP INDEX CONCURRENTLY IF EXISTS "trackpoint_device_seq_uniq"',
+                ),
+            ],
+            state_operations=[
+                migrations.AddConstraint(
+                    model_name='trackingpoint',
+                    constraint=models.UniqueConstraint(condition=models.Q(('seq__isnull', False)), fields=('runner', 'device_id', 'seq'), name='trackpoint_device_seq_uniq'),
+                ),
+            ],
+        ),
+    ]
@@ -1,15 +1,40 @@
 from django.contrib.gis.db import models
+from django.contrib.postgres.indexes import BrinIndex
+from django.utils import timezone
 from registration.models import Runner
 from core.models import Race
 
 class TrackingPoint(models.Model):
     runner = models.ForeignKey(Runner, on_delete=models.CASCADE)
-    race = models.ForeignKey(Race, on_delete=models.CASCADE)
+    # db_index=False: every composite index in Meta leads with race.
+    race = models.ForeignKey(Race, on_delete=models.CASCADE, db_index=False)
+    # spatial_index=True (the default) gives this column a GiST index,
+    # used by bounding-box / distance lookups on location.
     location = models.PointField()  # GIS Field!
-    timestamp = models.DateTimeField(auto_now_add=True)
+    # Device time of the fix; batches synced after a network gap carry their own.
+    timestamp = models.DateTimeField(default=timezone.now)
+    # Per-device sequence number for deduplicating retried / reordered batches.
+    device_id = models.CharField(max_length=64, blank=True, default='')
+    seq = models.PositiveBigIntegerField(null=True, blank=True)
 
     class Meta:
-        ordering = ['timestamp']
+        # No default ordering: every hot query orders explicitly, and an
+        # implicit ORDER BY timestamp on unqualified queries is pure cost.
+        indexes = [
+            # admin changelist: filter by race, keyset-paginate on id
+            models.Index(fields=['race', 'id'], name='trackpoint_race_id_idx'),
+            # post_location trace and dashboard "last point per runner"
+            models.Index(fields=['race', 'runner', '-timestamp'], name='trackpoint_race_runner_ts_idx'),
+            # append-only data: timestamp correlates with physical order
+            BrinIndex(fields=['timestamp'], name='trackpoint_ts_brin', autosummarize=True),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['runner', 'device_id', 'seq'],
+                condition=models.Q(seq__isnull=False),
+                name='trackpoint_device_seq_uniq',
+            ),
+        ]
 
     def __str__(self):
         return f"{self.runner} @ {self.timestamp}"
@@ -0,0 +1,35 @@
+# tracking/queries.py
+"""
+Hot TrackingPoint queries, shared by the views and the explain_hot_queries
+benchmark so the benchmark always measures what production runs.
+"""
+from .models import TrackingPoint
+
+
+def runner_trace(race_id, runner_id):
+    """All fixes of one runner in a race, oldest first (post_location)."""
+    return TrackingPoint.objects.filter(race_id=race_id, runner_id=runner_id).order_by("timestamp")
+
+
+def last_points(race_id):
+    """Latest fix per runner in a race (dashboard); one DISTINCT ON query."""
+    return (
+        TrackingPoint.objects.filter(race_id=race_id)
+        .select_related("runner")
+        .order_by("runner_id", "-timestamp")
+        .distinct("runner_id")
+    )
+
+
+def points_since(race_id, cursor):
+    """
+    Latest fix per runner among fixes with ``id > cursor``. The TrackingPoint
+    id is the race's update cursor: it only grows, so a reconnecting client
+    asks for what changed since the highest id it has seen.
+    """
+    return (
+        TrackingPoint.objects.filter(race_id=race_id, id__gt=cursor)
+        .select_related("runner")
+        .order_by("runner_id", "-id")
+        .distinct("runner_id")
+    )
@@ -16,6 +16,11 @@ const wsUrl =
 console.log("🌐 WebSocket URL:", wsUrl);
 
 let map, runners = {}, markers = {}, leaderboardBody;
+// Highest update cursor seen; on reconnect we only pull what changed since.
+let cursor = 0;
+// Ids commit slightly out of order under concurrent ingest (at most about
+// workers x 500-fix batches in flight), so resume this far behind the max.
+const RESUME_MARGIN = 5000;
 
 // --- Initialize map ---
 document.addEventListener("DOMContentLoaded", () => {
@@ -36,6 +41,7 @@ function connectSocket() {
 
   socket.onopen = () => {
     console.log("✅ WS connected");
+    socket.send(JSON.stringify({ cmd: "sync", cursor: cursor ? Math.max(cursor - RESUME_MARGIN, 1) : 0 }));
   };
 
   socket.onmessage = (event) => {
@@ -43,11 +49,28 @@ function connectSocket() {
       const data = JSON.parse(event.data);
       console.log("📡 Raw WS message:", data);
 
+      // Heartbeat: the server closes spectators that stop answering.
+      if (data.type === "ping") {
+        socket.send(JSON.stringify({ cmd: "pong" }));
+        return;
+      }
+
       if (data.type === "info") {
         console.log("ℹ️ " + data.message);
         return;
       }
 
+      if (data.type === "eta") {
+        updateEtas(data);
+        return;
+      }
+
+      if (data.type === "delta") {
+        data.runners.forEach(updateRunner);
+        cursor = Math.max(cursor, data.cursor);
+        return;
+      }
+
       updateRunner(data);
     } catch (e) {
       console.warn("⚠️ WS parse error", e);
@@ -69,6 +92,12 @@ function updateRunner(data) {
   const { runner_id, name, lat, lon, distance_m, pace_m_per_km, timestamp } = data;
   const id = String(runner_id);
 
+  // Skip updates older than what a delta already gave us for this runner
+  if (data.cursor) {
+    if (runners[id] && runners[id].cursor >= data.cursor) return;
+    cursor = Math.max(cursor, data.cursor);
+  }
+
   if (!runners[id]) {
     runners[id] = { name, totalDist: 0, lastLat: lat, lastLon: lon, lastTime: timestamp };
   }
@@ -78,6 +107,7 @@ function updateRunner(data) {
   runner.lat = lat;
   runner.lon = lon;
   runner.timestamp = timestamp;
+  if (data.cursor) runner.cursor = data.cursor;
 
   // Calculate incremental distance (reset on fresh start)
   const d = haversine(runner.lastLat, runner.lastLon, lat, lon);
@@ -106,6 +136,15 @@ function updateRunner(data) {
   renderLeaderboard();
 }
 
+// --- Finish ETAs pushed for the whole field ---
+function updateEtas(data) {
+  data.runners.forEach((e) => {
+    const r = runners[String(e.runner_id)];
+    if (r) r.eta = e.eta ? new Date(e.eta).toLocaleTimeString() : e.passed ? "🏁" : "—";
+  });
+  renderLeaderboard();
+}
+
 // --- Smooth movement ---
 function smoothMove(marker, lat, lon) {
   const start = marker.getLatLng();
@@ -133,12 +172,13 @@ function renderLeaderboard() {
     pace: r.pace,
     speed: r.speed,
     time: r.timestamp,
+    eta: r.eta || "—",
   }));
 
   arr.sort((a, b) => b.dist - a.dist);
 
   if (!arr.length) {
-    leaderboardBody.innerHTML = `<tr><td colspan="6" class="text-center text-muted">No runners yet</td></tr>`;
+    leaderboardBody.innerHTML = `<tr><td colspan="8" class="text-center text-muted">No runners yet</td></tr>`;
     return;
   }
 
@@ -153,6 +193,7 @@ function renderLeaderboard() {
       <td>${r.pace}</td>
       <td>${r.speed}</td>
       <td>${r.time.split("T").pop().split(".")[0]}</td>
+      <td>${r.eta}</td>
     </tr>`
     )
     .join("");
@@ -0,0 +1,145 @@
+# tracking/sync.py
+"""
+Client sync protocol.
+
+Ingest: a device sends batches of fixes, each tagged with a per-device
+``seq``. Batches may be retried, overlap or arrive out of order. Fixes
+whose ``(runner, device_id, seq)`` is already stored are skipped with one
+indexed lookup, and the rest go in with a single ``bulk_create``.
+
+Spectators: the TrackingPoint id is the race's update cursor. Every
+broadcast carries it, and a reconnecting client asks for the latest fix
+per runner since the highest cursor it has seen, not a full snapshot.
+Ids can commit slightly out of order under concurrent ingest. Pulls are
+idempotent, so clients resume a margin behind their maximum
+(RESUME_MARGIN in dashboard.js) and skip updates older than what they hold.
+"""
+import math
+from datetime import datetime, timezone as dt_timezone
+
+from django.contrib.gis.geos import Point
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from . import eta
+from .models import TrackingPoint
+from .queries import points_since
+
+MAX_BATCH = 500
+MAX_SEQ = 2 ** 63 - 1  # PositiveBigIntegerField
+
+
+def _parse_ts(value):
+    if value in (None, ""):
+        return timezone.now()
+    if isinstance(value, (int, float)):
+        try:
+            return datetime.fromtimestamp(value / 1000, dt_timezone.utc)  # epoch ms, as JS Date.now()
+        except (OverflowError, OSError, ValueError):
+            raise ValueError(f"ts out of range: {value!r}")
+    ts = parse_datetime(value) if isinstance(value, str) else None
+    if ts is None:
+        raise ValueError(f"invalid ts {value!r}")
+    return ts if timezone.is_aware(ts) else timezone.make_aware(ts, dt_timezone.utc)
+
+
+def parse_fixes(fixes):
+    """Validate raw fixes into ``{seq: (lat, lon, timestamp)}``; later duplicates win."""
+    if not isinstance(fixes, list) or not fixes:
+        raise ValueError("fixes must be a non-empty list")
+    if len(fixes) > MAX_BATCH:
+        raise ValueError(f"at most {MAX_BATCH} fixes per batch")
+    parsed = {}
+    for f in fixes:
+        seq, lat, lon = int(f["seq"]), float(f["lat"]), float(f["lon"])
+        if not 0 <= seq <= MAX_SEQ:
+            raise ValueError(f"seq out of range: {seq}")
+        # NaN fails both comparisons
+        if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+            raise ValueError(f"invalid coordinates: {lat}, {lon}")
+        parsed[seq] = (lat, lon, _parse_ts(f.get("ts")))
+    return parsed
+
+
+def _is_unique_violation(exc):
+    cause = exc.__cause__
+    # psycopg2 exposes pgcode, psycopg 3 sqlstate
+    return "23505" in (getattr(cause, "pgcode", None), getattr(cause, "sqlstate", None))
+
+
+def ingest_batch(race, runner, device_id, fixes):
+    """
+    Store the fixes of ``parse_fixes`` that are new. Returns
+    ``(created points, number of duplicates, ETA state)``.
+    """
+    existing = set(
+        TrackingPoint.objects.filter(runner=runner, device_id=device_id, seq__in=list(fixes))
+        .values_list("seq", flat=True)
+    )
+    points = [
+        TrackingPoint(
+            runner=runner, race=race, device_id=device_id, seq=seq,
+            location=Point(lon, lat), timestamp=ts,
+        )
+        for seq, (lat, lon, ts) in sorted(fixes.items())
+        if seq not in existing
+    ]
+    try:
+        with transaction.atomic():
+            TrackingPoint.objects.bulk_create(points)
+    except IntegrityError as e:
+        if not _is_unique_violation(e):
+            raise
+        # A concurrent retry of the same batch got there first; keep whatever
+        # is still new. ignore_conflicts returns no ids, so reload the rows
+        # (some stored by the other request; folding them again is harmless).
+        TrackingPoint.objects.bulk_create(points, ignore_conflicts=True)
+        points = list(
+            TrackingPoint.objects.filter(runner=runner, device_id=device_id, seq__in=[p.seq for p in points])
+            .order_by("seq")
+        )
+
+    state = None
+    if points:
+        state = eta.update_many(
+            race.id, runner.id, [(p.location.y, p.location.x, p.timestamp.timestamp()) for p in points]
+        )
+    return points, len(fixes) - len(points), state
+
+
+def runner_message(runner, point, state):
+    """
+    The per-runner update sent on the race group and in deltas. Without a
+    cached ETA state (cache flushed, or dropped by the race teardown job)
+    distance and pace are unknown and sent as null.
+    """
+    distance = state["distance_m"] if state else None
+    elapsed = state["t"] - state["start_t"] if state else 0.0
+    pace_m_per_km = (elapsed / (distance / 1000)) if distance else 0
+    return {
+        "runner_id": runner.id,
+        "name": f"{runner.first_name} {runner.last_name}",
+        "lat": point.location.y,
+        "lon": point.location.x,
+        "distance_m": round(distance, 2) if distance is not None else None,
+        "pace_m_per_km": round(pace_m_per_km, 2) if pace_m_per_km else None,
+        "timestamp": point.timestamp.strftime("%H:%M:%S"),
+        "cursor": point.id,
+    }
+
+
+def delta_since(race_id, cursor):
+    """Latest state of every runner that moved after ``cursor``."""
+    points = list(points_since(race_id, cursor))
+    states = cache.get_many([eta.state_key(race_id, p.runner_id) for p in points])
+    return {
+        "type": "delta",
+        "race_id": race_id,
+        "cursor": max((p.id for p in points), default=cursor),
+        "runners": [
+            runner_message(p.runner, p, states.get(eta.state_key(race_id, p.runner_id)))
+            for p in points
+        ],
+    }
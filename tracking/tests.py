@@ -1,3 +1,183 @@
-from django.test import TestCase
+import asyncio
+from unittest import mock
 
-# Create your tests here.
+import numpy as np
+from channels.layers import get_channel_layer
+from channels.routing import URLRouter
+from channels.testing import WebsocketCommunicator
+from django.test import SimpleTestCase, override_settings
+
+from . import consumers, eta, sync
+from .routing import websocket_urlpatterns
+
+IN_MEMORY_LAYERS = {"default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}}
+
+
+class RaceOutboxTests(SimpleTestCase):
+    def test_conflates_pending_updates_per_runner(self):
+        outbox = consumers.RaceOutbox(maxsize=10)
+        outbox.put(1, {"runner_id": 1, "lat": 1.0})
+        outbox.put(2, {"runner_id": 2, "lat": 2.0})
+        outbox.put(1, {"runner_id": 1, "lat": 1.5})
+
+        self.assertEqual(len(outbox), 2)
+        self.assertEqual(outbox.conflated, 1)
+        first = asyncio.run(outbox.get())
+        self.assertEqual(first, {"runner_id": 1, "lat": 1.5})
+
+    def test_drops_oldest_when_full(self):
+        outbox = consumers.RaceOutbox(maxsize=2)
+        for runner_id in (1, 2, 3):
+            outbox.put(runner_id, {"runner_id": runner_id})
+
+        self.assertEqual(outbox.dropped, 1)
+        self.assertEqual(asyncio.run(outbox.get()), {"runner_id": 2})
+
+    def test_pending_ping_is_replaced_without_counting(self):
+        outbox = consumers.RaceOutbox(maxsize=10)
+        before = consumers.stats["conflated"]
+        outbox.put(consumers.PING_KEY, {"type": "ping"})
+        outbox.put(consumers.PING_KEY, {"type": "ping"})
+        self.assertEqual(len(outbox), 1)
+        self.assertEqual((outbox.conflated, consumers.stats["conflated"]), (0, before))
+
+    def test_messages_without_runner_are_not_conflated(self):
+        outbox = consumers.RaceOutbox(maxsize=10)
+        outbox.put(None, {"type": "info"})
+        outbox.put(None, {"type": "info"})
+        self.assertEqual(len(outbox), 2)
+        self.assertEqual(outbox.conflated, 0)
+
+
+class EtaStateTests(SimpleTestCase):
+    def test_advance_accumulates_distance_and_smooths_pace(self):
+        state = eta.advance(None, 0.0, 0.0, 1000.0)
+        state = eta.advance(state, 0.0, 0.001, 1040.0, alpha=0.5)  # ~111 m in 40 s
+        self.assertAlmostEqual(state["distance_m"], 111.2, delta=0.5)
+        first_pace = state["pace_s_per_m"]
+        state = eta.advance(state, 0.0, 0.002, 1060.0, alpha=0.5)  # same distance, twice as fast
+        self.assertAlmostEqual(state["pace_s_per_m"], 0.75 * first_pace, places=4)
+        self.assertEqual(state["start_t"], 1000.0)
+
+    def test_advance_ignores_stale_fixes_and_jitter(self):
+        state = eta.advance(None, 0.0, 0.0, 1000.0)
+        self.assertIs(eta.advance(state, 1.0, 1.0, 999.0), state)
+        still = eta.advance(state, 0.0, 0.000001, 1010.0)
+        self.assertEqual(still["distance_m"], 0.0)
+        self.assertEqual(still["t"], 1010.0)
+
+    def test_update_many_replays_trace_for_late_fixes(self):
+        state = eta.advance(None, 0.0, 0.0, 1000.0)
+        with mock.patch.object(eta, "cache") as cache, mock.patch.object(eta, "rebuild", return_value=None) as rebuild:
+            cache.get.return_value = state
+            eta.update_many(1, 2, [(0.0, 0.0, 1000.0)])  # duplicate of the current fix
+            rebuild.assert_not_called()
+            eta.update_many(1, 2, [(0.0, 0.0, 990.0), (0.0, 0.001, 1040.0)])
+            rebuild.assert_called_once_with(1, 2)
+
+    def test_compute_etas_is_vectorized_over_the_field(self):
+        result = eta.compute_etas(
+            np.array([1000.0, 5000.0, 12000.0]),
+            np.array([0.3, np.nan, 0.3]),
+            np.array([100.0, 100.0, 100.0]),
+            10000.0,
+        )
+        self.assertEqual(result[0], 100.0 + 9000 * 0.3)
+        self.assertTrue(np.isnan(result[1]))  # no pace yet
+        self.assertTrue(np.isnan(result[2]))  # already past the target
+
+
+class SyncBatchTests(SimpleTestCase):
+    def test_parse_fixes_keys_by_seq_and_keeps_last_duplicate(self):
+        fixes = sync.parse_fixes([
+            {"seq": 2, "lat": 1, "lon": 2, "ts": 1760000000000},
+            {"seq": 1, "lat": 3, "lon": 4, "ts": "2025-10-09T07:00:00Z"},
+            {"seq": 2, "lat": 5, "lon": 6, "ts": 1760000001000},
+        ])
+        self.assertEqual(sorted(fixes), [1, 2])
+        self.assertEqual(fixes[2][:2], (5.0, 6.0))
+        self.assertEqual(fixes[2][2].timestamp(), 1760000001.0)
+        self.assertEqual(fixes[1][2].isoformat(), "2025-10-09T07:00:00+00:00")
+
+    def test_parse_fixes_rejects_bad_batches(self):
+        for bad in (None, [], [{"lat": 1, "lon": 2}], [{"seq": 1, "lat": 1, "lon": 2, "ts": "yesterday"}]):
+            with self.assertRaises((KeyError, ValueError)):
+                sync.parse_fixes(bad)
+        with self.assertRaises(ValueError):
+            sync.parse_fixes([{"seq": i, "lat": 0, "lon": 0} for i in range(sync.MAX_BATCH + 1)])
+
+    def test_parse_fixes_rejects_values_the_database_would_refuse(self):
+        for bad in (
+            {"seq": -1, "lat": 0, "lon": 0},
+            {"seq": 1, "lat": float("nan"), "lon": 0},
+            {"seq": 1, "lat": 91, "lon": 0},
+            {"seq": 1, "lat": 0, "lon": -181},
+            {"seq": 1, "lat": 0, "lon": 0, "ts": 10 ** 20},
+            {"seq": 1, "lat": 0, "lon": 0, "ts": ["2025"]},
+        ):
+            with self.subTest(bad=bad), self.assertRaises(ValueError):
+                sync.parse_fixes([bad])
+
+    def test_unknown_state_sends_null_distance(self):
+        runner = mock.Mock(id=1, first_name="A", last_name="B")
+        point = mock.Mock(id=9, location=mock.Mock(x=2.0, y=1.0))
+        message = sync.runner_message(runner, point, None)
+        self.assertEqual((message["distance_m"], message["pace_m_per_km"]), (None, None))
+
+
+@override_settings(CHANNEL_LAYERS=IN_MEMORY_LAYERS)
+class RaceTrackerConsumerTests(SimpleTestCase):
+    async def _connect(self, race_id=1):
+        communicator = WebsocketCommunicator(URLRouter(websocket_urlpatterns), f"/ws/race/{race_id}/")
+        connected, _ = await communicator.connect()
+        self.assertTrue(connected)
+        greeting = await communicator.receive_json_from()
+        self.assertEqual(greeting["type"], "info")
+        return communicator
+
+    async def test_race_update_is_delivered(self):
+        communicator = await self._connect()
+        await get_channel_layer().group_send(
+            "race_1", {"type": "race_update", "message": {"runner_id": 7, "lat": 1.0}}
+        )
+        self.assertEqual(await communicator.receive_json_from(), {"runner_id": 7, "lat": 1.0})
+        await communicator.disconnect()
+
+    @override_settings(TRACKING_WS_SEND_TIMEOUT=0.05)
+    async def test_stalled_client_is_disconnected(self):
+        communicator = await self._connect()
+
+        async def stalled_send(self, content, close=False):
+            await asyncio.sleep(10)
+
+        before = consumers.stats["slow_disconnects"]
+        with mock.patch.object(consumers.RaceTrackerConsumer, "send_json", stalled_send), \
+                self.assertLogs("tracking.consumers", "WARNING"):
+            await get_channel_layer().group_send(
+                "race_1", {"type": "race_update", "message": {"runner_id": 7}}
+            )
+            output = await communicator.receive_output(timeout=1)
+
+        self.assertEqual(output, {"type": "websocket.close", "code": consumers.SLOW_CONSUMER_CLOSE_CODE})
+        self.assertEqual(consumers.stats["slow_disconnects"], before + 1)
+        await communicator.disconnect()
+
+    @override_settings(TRACKING_WS_PING_INTERVAL=0.05, TRACKING_WS_STALL_TIMEOUT=0.2)
+    async def test_client_that_stops_answering_pings_is_disconnected(self):
+        # Daphne's send() never blocks, so the heartbeat is what catches a stalled socket.
+        communicator = await self._connect()
+        self.assertEqual(await communicator.receive_json_from(), {"type": "ping"})
+        await communicator.send_json_to({"cmd": "pong"})
+
+        with self.assertLogs("tracking.consumers", "WARNING"):
+            while (output := await communicator.receive_output(timeout=1))["type"] == "websocket.send":
+                pass
+        self.assertEqual(output, {"type": "websocket.close", "code": consumers.SLOW_CONSUMER_CLOSE_CODE})
+        await communicator.disconnect()
+
+    @override_settings(TRACKING_WS_PING_INTERVAL=0.05, TRACKING_WS_STALL_TIMEOUT=0.1)
+    async def test_client_that_never_pongs_is_not_disconnected(self):
+        communicator = await self._connect()
+        for _ in range(6):  # well past the stall timeout: only pings arrive
+            self.assertEqual(await communicator.receive_json_from(timeout=1), {"type": "ping"})
+        await communicator.disconnect()
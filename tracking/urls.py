@@ -2,8 +2,18 @@
 from django.urls import path
 from . import views
 
-urlpatterns = [
-    path("race/<int:race_id>/dashboard/", views.dashboard, name="dashboard"),
+# Served on every profile; the ingest profile (race_management.urls_ingest)
+# routes only these.
+api_urlpatterns = [
     path("api/tracking/<int:race_id>/post_location/", views.post_location, name="post_location"),
+    path("api/tracking/<int:race_id>/sync/", views.sync_locations, name="sync_locations"),
+    path("api/tracking/<int:race_id>/updates/", views.race_updates, name="race_updates"),
+    path("api/tracking/<int:race_id>/eta/", views.race_eta, name="race_eta"),
+    path("ws-stats/", views.ws_stats, name="ws_stats"),
+    path("healthz/", views.healthz, name="healthz"),
 ]
 
+urlpatterns = [
+    path("race/<int:race_id>/dashboard/", views.dashboard, name="dashboard"),
+    *api_urlpatterns,
+]
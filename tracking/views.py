@@ -6,27 +6,25 @@ from django.utils import timezone
 from registration.models import Runner
 from core.models import Race
 from .models import TrackingPoint
+from .queries import last_points
+from . import consumers, eta, sync
 from channels.layers import get_channel_layer
 from asgiref.sync import async_to_sync
-from geopy.distance import geodesic
 import json
 
 def dashboard(request, race_id):
     race = get_object_or_404(Race, id=race_id)
-    runner_ids = TrackingPoint.objects.filter(race=race).values_list("runner_id", flat=True).distinct()
-    runners = Runner.objects.filter(id__in=runner_ids)
 
     runner_data = []
-    for runner in runners:
-        last_point = TrackingPoint.objects.filter(runner=runner, race=race).order_by("-timestamp").first()
-        if last_point:
-            runner_data.append({
-                "runner_id": runner.id,
-                "name": f"{runner.first_name} {runner.last_name}",
-                "lat": last_point.location.y,
-                "lon": last_point.location.x,
-                "time": last_point.timestamp.strftime("%H:%M:%S"),
-            })
+    for last_point in last_points(race.id):
+        runner = last_point.runner
+        runner_data.append({
+            "runner_id": runner.id,
+            "name": f"{runner.first_name} {runner.last_name}",
+            "lat": last_point.location.y,
+            "lon": last_point.location.x,
+            "time": last_point.timestamp.strftime("%H:%M:%S"),
+        })
 
     context = {"race": race, "runners": runner_data}
     return render(request, "tracking/dashboard.html", context)
@@ -45,7 +43,7 @@ def post_location(request, race_id):
         if not (runner_id and lat and lon):
             return JsonResponse({"error": "Missing fields"}, status=400)
 
-        race = get_object_or_404(Race, id=race_id)
+        race = get_object_or_404(Race.objects.select_related("category"), id=race_id)
         runner = get_object_or_404(Runner, id=runner_id)
         location = Point(float(lon), float(lat))
         timestamp = timezone.now()
@@ -53,34 +51,9 @@ def post_location(request, race_id):
         # Save new tracking point
         tp = TrackingPoint.objects.create(runner=runner, race=race, location=location, timestamp=timestamp)
 
-        # --- Compute total distance from first point ---
-        points = TrackingPoint.objects.filter(runner=runner, race=race).order_by("timestamp")
-        total_distance = 0.0
-        prev_point = None
-        for p in points:
-            if prev_point:
-                segment = geodesic(
-                    (prev_point.location.y, prev_point.location.x),
-                    (p.location.y, p.location.x)
-                ).meters
-                if segment > 0.5:  # ignore GPS jitter
-                    total_distance += segment
-            prev_point = p
-
-        # --- Compute pace (min/km) ---
-        first_time = points.first().timestamp
-        total_seconds = (timestamp - first_time).total_seconds()
-        pace_m_per_km = (total_seconds / (total_distance / 1000)) if total_distance > 0 else 0
-
-        message = {
-            "runner_id": runner.id,
-            "name": f"{runner.first_name} {runner.last_name}",
-            "lat": float(lat),
-            "lon": float(lon),
-            "distance_m": round(total_distance, 2),
-            "pace_m_per_km": round(pace_m_per_km, 2) if pace_m_per_km else None,
-            "timestamp": tp.timestamp.strftime("%H:%M:%S"),
-        }
+        # --- Distance and pace from the runner's incremental ETA state ---
+        state = eta.update(race.id, runner.id, location.y, location.x, tp.timestamp.timestamp())
+        message = sync.runner_message(runner, tp, state)
 
         # Broadcast via WebSocket
         channel_layer = get_channel_layer()
@@ -88,7 +61,77 @@ def post_location(request, race_id):
             f"race_{race_id}",
             {"type": "race_update", "message": message},
         )
+        eta.maybe_push(race)
 
         return JsonResponse({"status": "ok", "data": message})
     except Exception as e:
         return JsonResponse({"error": str(e)}, status=500)
+
+
+@csrf_exempt
+def sync_locations(request, race_id):
+    """
+    Batch ingest for offline-first clients:
+    ``{"runner_id", "device_id", "fixes": [{"seq", "lat", "lon", "ts"}]}``.
+    Already-stored seqs are skipped, so a batch can be retried safely; once
+    the response arrives the client can drop every fix up to ``ack_seq``.
+    """
+    if request.method != "POST":
+        return JsonResponse({"error": "POST only"}, status=405)
+    try:
+        data = json.loads(request.body)
+        runner_id = int(data["runner_id"])
+        device_id = str(data.get("device_id", ""))[:64]
+        fixes = sync.parse_fixes(data.get("fixes"))
+    except (KeyError, TypeError, ValueError, OverflowError) as e:
+        return JsonResponse({"error": f"Invalid batch: {e}"}, status=400)
+
+    race = get_object_or_404(Race.objects.select_related("category"), id=race_id)
+    runner = get_object_or_404(Runner, id=runner_id)
+    created, duplicates, state = sync.ingest_batch(race, runner, device_id, fixes)
+
+    if created:
+        latest = max(created, key=lambda p: p.timestamp)
+        channel_layer = get_channel_layer()
+        async_to_sync(channel_layer.group_send)(
+            f"race_{race_id}",
+            {"type": "race_update", "message": sync.runner_message(runner, latest, state)},
+        )
+        eta.maybe_push(race)
+
+    return JsonResponse({
+        "status": "ok",
+        "accepted": len(created),
+        "duplicates": duplicates,
+        "ack_seq": max(fixes),
+    })
+
+
+def race_updates(request, race_id):
+    """Spectator delta pull: latest state of runners that moved after ``?since=``."""
+    get_object_or_404(Race, id=race_id)
+    try:
+        since = int(request.GET.get("since", 0))
+    except ValueError:
+        return JsonResponse({"error": "since must be an integer"}, status=400)
+    return JsonResponse(sync.delta_since(race_id, since))
+
+
+def race_eta(request, race_id):
+    """ETA at ``?km=`` (default: the finish) for every runner of the race."""
+    race = get_object_or_404(Race.objects.select_related("category"), id=race_id)
+    try:
+        at_km = float(request.GET["km"]) if request.GET.get("km") else None
+    except ValueError:
+        return JsonResponse({"error": "km must be a number"}, status=400)
+    return JsonResponse(eta.field_etas(race, at_km))
+
+
+def ws_stats(request):
+    """Spectator socket backpressure counters of this worker process."""
+    return JsonResponse(consumers.stats)
+
+
+def healthz(request):
+    """Readiness probe: the app is imported and serving requests."""
+    return JsonResponse({"status": "ok"})